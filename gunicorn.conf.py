@@ -0,0 +1,40 @@
+"""Konfigurasi gunicorn: gunicorn -c gunicorn.conf.py wsgi:application
+
+Skema dan data awal tidak dibuat di sini (flask --app app init-db), jadi worker
+hanya import app. Tiap worker memuat app sendiri setelah fork (preload_app mati),
+sehingga pool koneksi DB, thread pool hash dan thread sweeper tidak ikut di-fork.
+"""
+import multiprocessing
+import os
+
+# semua worker berbagi versi cache katalog, event kursi dan token limiter login lewat database.
+# /metrics (INSTRUMENTATION=1) tetap per worker: tiap scrape dijawab satu worker, label pid
+# di bioskop_worker_info menunjukkan yang mana; jumlahkan per pid di Prometheus.
+os.environ.setdefault('SHARED_STATE', 'database')
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = os.environ.get('BIND', '0.0.0.0:' + os.environ.get('PORT', '8000'))
+# Di belakang load balancer / nginx: set TRUSTED_PROXIES=<jumlah proxy> supaya app memakai
+# IP klien dari X-Forwarded-For (ProxyFix). Tanpa itu semua klien berbagi satu bucket
+# limiter login milik IP proxy. Jangan diset jika worker bisa diakses langsung (header bisa dipalsukan).
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# gthread: setiap stream SSE kursi (halaman booking yang terbuka) memegang satu thread
+# selama halaman terbuka. Thread dibuat jauh di atas jumlah stream yang diharapkan, dan
+# SSE_MAX_STREAMS menyisakan SSE_RESERVED_THREADS thread untuk request biasa (/healthz,
+# booking); stream di atas batas dijawab 503 dan halaman booking beralih ke polling.
+# Untuk ribuan stream: jalankan instance kedua khusus SSE dengan worker async,
+#   GUNICORN_WORKER_CLASS=gevent gunicorn -c gunicorn.conf.py -b :8001 wsgi:application
+# lalu arahkan /movie/<id>/seats/stream ke port itu di proxy (pip install gevent).
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 64))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000)) # hanya worker gevent
+if worker_class == 'gthread':
+    os.environ.setdefault('SSE_MAX_STREAMS', str(max(1, threads - int(os.environ.get('SSE_RESERVED_THREADS', 16)))))
+preload_app = False
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+# worker didaur ulang bergantian (jitter) supaya tidak restart bersamaan
+max_requests = int(os.environ.get('MAX_REQUESTS', 5000))
+max_requests_jitter = max_requests // 10
+accesslog = os.environ.get('ACCESS_LOG', '-')
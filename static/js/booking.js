@@ -6,12 +6,9 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     const price = bookingConfig.price;
-    const bookedSeats = bookingConfig.bookedSeats;
     const movieId = bookingConfig.movieId;
 
     // definisi elemen DOM
-    const rows = ['A', 'B', 'C', 'D', 'E'];
-    const cols = 6;
     const seatMap = document.getElementById('seatMap');
     const openPaymentBtn = document.getElementById('openPaymentBtn');
     const confirmPayBtn = document.getElementById('confirmPayBtn');
@@ -20,33 +17,91 @@ document.addEventListener('DOMContentLoaded', function() {
     const loadingOverlay = document.getElementById('loadingOverlay');
 
     let selectedSeats = [];
+    let holdTimer = null;
 
-    // generate kursi (grid system)
-    rows.forEach(row => {
-        for (let i = 1; i <= cols; i++) {
-            const seatId = row + i;
-            const seatDiv = document.createElement('div');
-            seatDiv.classList.add('seat');
-            seatDiv.innerText = seatId;
-            
-            if (bookedSeats.includes(seatId)) {
-                seatDiv.classList.add('occupied');
-            } else {
-                seatDiv.addEventListener('click', () => {
-                    if (seatDiv.classList.contains('selected')) {
-                        seatDiv.classList.remove('selected');
-                        selectedSeats = selectedSeats.filter(s => s !== seatId);
-                    } else {
-                        seatDiv.classList.add('selected');
-                        selectedSeats.push(seatId);
-                    }
-                    updateInfo();
-                });
-            }
-            seatMap.appendChild(seatDiv);
+    // klik kursi lewat event delegation, jadi kursi bisa berubah status secara live
+    seatMap.addEventListener('click', (event) => {
+        const seatDiv = event.target.closest('.seat');
+        if (!seatDiv || seatDiv.classList.contains('occupied')) return;
+        const seatId = seatDiv.dataset.seat;
+        if (seatDiv.classList.contains('selected')) {
+            seatDiv.classList.remove('selected');
+            selectedSeats = selectedSeats.filter(s => s !== seatId);
+        } else {
+            seatDiv.classList.add('selected');
+            selectedSeats.push(seatId);
         }
+        updateInfo();
+        scheduleHold();
     });
 
+    // ambil layout studio + bitmap kursi terisi dari server
+    function loadSeats() {
+        fetch(bookingConfig.seatsUrl)
+            .then(response => response.json())
+            .then(renderSeats)
+            .catch(error => console.error('Gagal memuat peta kursi:', error));
+    }
+
+    // generate kursi (grid system), cek terisi O(1) per kursi lewat bitmap
+    function renderSeats(layout) {
+        const bits = Uint8Array.from(atob(layout.booked), c => c.charCodeAt(0));
+        const held = new Set(layout.held);
+        const cols = layout.cols;
+        seatMap.innerHTML = '';
+        seatMap.style.gridTemplateColumns = `repeat(${cols}, 1fr)`;
+
+        layout.rows.forEach((row, r) => {
+            for (let i = 1; i <= cols; i++) {
+                const seatId = row + i;
+                const idx = r * cols + i - 1;
+                const seatDiv = document.createElement('div');
+                seatDiv.classList.add('seat');
+                seatDiv.dataset.seat = seatId;
+                seatDiv.innerText = seatId;
+
+                if ((bits[idx >> 3] & (1 << (idx & 7))) || held.has(seatId)) {
+                    seatDiv.classList.add('occupied');
+                } else if (selectedSeats.includes(seatId)) {
+                    seatDiv.classList.add('selected');
+                }
+                seatMap.appendChild(seatDiv);
+            }
+        });
+        // kursi pilihan yang ternyata sudah terisi dibuang dari pilihan
+        selectedSeats = selectedSeats.filter(s => seatMap.querySelector(`[data-seat="${s}"].selected`));
+        updateInfo();
+    }
+
+    // update kursi secara live dari server (Server-Sent Events)
+    let pollTimer = null;
+    if (window.EventSource) {
+        const stream = new EventSource(bookingConfig.streamUrl);
+        // 'ready' dikirim setiap (re)connect, peta kursi diambil ulang supaya tidak ada event yang terlewat
+        stream.addEventListener('ready', loadSeats);
+        stream.onmessage = (event) => {
+            const change = JSON.parse(event.data);
+            if (change.type === 'resync') {
+                loadSeats();
+            } else if (change.type === 'released') {
+                markFree(change.seats);
+            } else {
+                // 'booked' atau 'held': hold milik sendiri tidak perlu ditandai
+                const others = change.type === 'held' ? change.seats.filter(s => !selectedSeats.includes(s)) : change.seats;
+                markOccupied(others);
+            }
+        };
+        // stream ditolak (503 saat slot SSE worker penuh): 'ready' tidak pernah datang,
+        // jadi peta kursi langsung diambil lalu diambil ulang berkala
+        stream.onerror = () => {
+            if (stream.readyState !== EventSource.CLOSED || pollTimer) return;
+            loadSeats();
+            pollTimer = setInterval(loadSeats, 5000);
+        };
+    } else {
+        loadSeats();
+    }
+
     // update info harga & status tombol
     function updateInfo() {
         const currentTotal = selectedSeats.length * price;
@@ -61,6 +116,55 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    // hold kursi terpilih di server supaya tidak direbut saat mengisi pembayaran
+    function scheduleHold() {
+        clearTimeout(holdTimer);
+        holdTimer = setTimeout(syncHold, 400);
+    }
+
+    async function syncHold() {
+        try {
+            const response = await fetch('/hold_seats', {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({ movie_id: movieId, seats: selectedSeats })
+            });
+            const result = await response.json();
+            if (result.status === 'conflict') {
+                markOccupied(result.conflicts);
+                alert(result.msg);
+                scheduleHold();
+            }
+        } catch (error) {
+            console.error('Hold gagal:', error);
+        }
+    }
+
+    // lepas hold saat meninggalkan halaman tanpa bayar
+    window.addEventListener('pagehide', () => {
+        if (selectedSeats.length === 0) return;
+        const payload = new Blob([JSON.stringify({ movie_id: movieId, seats: [] })], {type: 'application/json'});
+        navigator.sendBeacon('/hold_seats', payload);
+    });
+
+    function markOccupied(seats) {
+        seats.forEach(seatId => {
+            const seatDiv = seatMap.querySelector(`[data-seat="${seatId}"]`);
+            if (!seatDiv) return;
+            seatDiv.classList.remove('selected');
+            seatDiv.classList.add('occupied');
+        });
+        selectedSeats = selectedSeats.filter(s => !seats.includes(s));
+        updateInfo();
+    }
+
+    function markFree(seats) {
+        seats.forEach(seatId => {
+            const seatDiv = seatMap.querySelector(`[data-seat="${seatId}"]`);
+            if (seatDiv) seatDiv.classList.remove('occupied');
+        });
+    }
+
     // logika konfirmasi bayar (kirim ke backend/python)
     if (confirmPayBtn) {
         confirmPayBtn.addEventListener('click', async () => {
@@ -77,7 +181,13 @@ document.addEventListener('DOMContentLoaded', function() {
                     const result = await response.json();
                     
                     if (result.status === 'success') {
+                        selectedSeats = [];
                         window.location.href = "/history";
+                    } else if (result.status === 'conflict') {
+                        // kursi yang kalah rebutan ditandai terisi, sisanya tetap terpilih
+                        markOccupied(result.conflicts);
+                        alert(result.msg);
+                        if(loadingOverlay) loadingOverlay.style.display = 'none';
                     } else {
                         alert(result.msg);
                         if(loadingOverlay) loadingOverlay.style.display = 'none';
@@ -19,4 +19,45 @@ function downloadTicket(elementId, movieTitle) {
     };
 
     html2pdf().set(opt).from(element).save();
-}
\ No newline at end of file
+}
+
+// tombol simpan PDF (juga untuk tiket yang dimuat belakangan)
+document.addEventListener('click', function (e) {
+    const button = e.target.closest('.js-download');
+    if (button) downloadTicket(button.dataset.ticket, button.dataset.title);
+});
+
+// --- MUAT HALAMAN BERIKUTNYA (cursor) ---
+function renderTicket(order) {
+    const node = document.getElementById('ticket-template').content.firstElementChild.cloneNode(true);
+    node.querySelector('.ticket-card').id = `ticket-${order.id}`;
+    node.querySelector('.js-poster').src = order.image || `https://ui-avatars.com/api/?name=${encodeURIComponent(order.title)}&background=000&color=fff`;
+    node.querySelector('.js-title').textContent = order.title;
+    node.querySelector('.js-showtime').textContent = order.showtime || 'Segera';
+    node.querySelector('.js-id').textContent = `#TX-${order.id}`;
+    node.querySelector('.js-seats').textContent = order.seats.join(', ');
+    const button = node.querySelector('.js-download');
+    button.dataset.ticket = `ticket-${order.id}`;
+    button.dataset.title = order.title;
+    return node;
+}
+
+const loadMore = document.getElementById('load-more');
+if (loadMore) {
+    loadMore.addEventListener('click', function () {
+        loadMore.disabled = true;
+        fetch(`${loadMore.dataset.url}?cursor=${encodeURIComponent(loadMore.dataset.cursor)}`)
+            .then(res => res.json())
+            .then(data => {
+                const list = document.getElementById('ticket-list');
+                data.orders.forEach(order => list.appendChild(renderTicket(order)));
+                if (data.next_cursor) {
+                    loadMore.dataset.cursor = data.next_cursor;
+                    loadMore.disabled = false;
+                } else {
+                    loadMore.remove();
+                }
+            })
+            .catch(() => { loadMore.disabled = false; });
+    });
+}
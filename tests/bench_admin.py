@@ -0,0 +1,73 @@
+"""Benchmark render halaman /admin: implementasi lama (N+1) vs query teragregasi.
+
+    python tests/bench_admin.py --movies 500 --bookings 1000000
+"""
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+import bench_common
+
+
+def register_legacy_view(bioskop):
+    """Pasang ulang admin_panel versi lama di /bench/admin_legacy sebagai pembanding."""
+    from flask import render_template, request
+    from sqlalchemy import func
+    db, Booking, User, Movie = bioskop.db, bioskop.Booking, bioskop.User, bioskop.Movie
+
+    def admin_legacy():
+        movies = Movie.query.all()
+        filter_date = request.args.get('date')
+        daily_sales = db.session.query(Booking, User, Movie).join(User).join(Movie).filter(func.date(Booking.booking_date) == filter_date).all()
+        daily_revenue = sum(sale[2].price for sale in daily_sales)
+        ticket_counts = [Booking.query.filter_by(movie_id=movie.id).count() for movie in movies]
+        rows = [SimpleNamespace(created_at=b.booking_date, username=u.username, title=m.title, seats=b.seat_number, total=m.price)
+                for b, u, m in daily_sales]
+        return render_template('admin.html', movies=movies, studios=[], daily_sales=rows, daily_revenue=daily_revenue,
+                               selected_date=filter_date, chart_labels=[m.title for m in movies], chart_values=ticket_counts,
+                               sales_count=len(rows), page=1, pages=1)
+
+    bioskop.app.add_url_rule('/bench/admin_legacy', 'admin_legacy', admin_legacy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=500)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--bookings', type=int, default=1000000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--legacy-repeat', type=int, default=2)
+    args = parser.parse_args()
+
+    bioskop = bench_common.load_app()
+    register_legacy_view(bioskop)
+    t0 = time.perf_counter()
+    movie_ids = bench_common.seed_movies(bioskop, args.movies)
+    user_ids = bench_common.seed_users(bioskop, args.users)
+    bench_common.seed_bookings(bioskop, movie_ids, user_ids, args.bookings, days=args.days)
+    seed_s = time.perf_counter() - t0
+
+    client = bench_common.client_for(bioskop, user_ids[0], username='admin')
+    day = bench_common.busiest_day(bioskop)
+    bench_common.check_admin_totals(client, day)
+    after = bench_common.time_requests(client, f'/admin?date={day}', args.repeat)
+    before = bench_common.time_requests(client, f'/bench/admin_legacy?date={day}', args.legacy_repeat)
+
+    report = {
+        'benchmark': 'admin_panel',
+        'timestamp': bench_common.stamp(),
+        'movies': args.movies,
+        'bookings': args.bookings,
+        'date': day,
+        'seed_s': round(seed_s, 1),
+        'before': bench_common.latency_summary(before),
+        'after': bench_common.latency_summary(after),
+        'speedup_p50': round(bench_common.percentile(before, 50) / max(bench_common.percentile(after, 50), 1e-9), 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
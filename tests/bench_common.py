@@ -0,0 +1,149 @@
+"""Helper bersama untuk script benchmark di folder tests/.
+
+Benchmark selalu jalan di database SQLite sementara (bukan bioskop.db),
+jadi DATABASE_URL harus diset sebelum modul app di-import.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def load_app(db_path=None):
+    """Import app dengan database benchmark dan buat skemanya."""
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='bioskop_bench_'), 'bench.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + db_path
+    import app as bioskop
+    with bioskop.app.app_context():
+        bioskop.db.create_all()
+    return bioskop
+
+
+def seed_users(bioskop, count, prefix='bench'):
+    """Buat `count` user dummy dengan satu insert batch, return list id."""
+    from sqlalchemy import insert, select
+    with bioskop.app.app_context():
+        rows = [dict(username=f'{prefix}_{i}', password='x' * 60) for i in range(count)]
+        bioskop.db.session.execute(insert(bioskop.User), rows)
+        bioskop.db.session.commit()
+        return [r[0] for r in bioskop.db.session.execute(
+            select(bioskop.User.id).where(bioskop.User.username.like(f'{prefix}_%')))]
+
+
+def seed_movie(bioskop, title='Bench Premiere', price=50000, status='now'):
+    with bioskop.app.app_context():
+        movie = bioskop.Movie(title=title, price=price, status=status, showtime='19:00')
+        bioskop.db.session.add(movie)
+        bioskop.db.session.commit()
+        return movie.id
+
+
+def client_for(bioskop, user_id, username='bench'):
+    """Test client yang sudah 'login' tanpa lewat hashing password."""
+    client = bioskop.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+        sess['username'] = username
+    return client
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = (len(values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def latency_summary(samples_ms):
+    return {
+        'count': len(samples_ms),
+        'p50_ms': round(percentile(samples_ms, 50), 3),
+        'p95_ms': round(percentile(samples_ms, 95), 3),
+        'p99_ms': round(percentile(samples_ms, 99), 3),
+        'max_ms': round(max(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+def stamp():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def seed_movies(bioskop, count, price=50000):
+    """Buat `count` film 'now' dengan satu insert batch, return list id."""
+    from sqlalchemy import insert, select
+    with bioskop.app.app_context():
+        rows = [dict(title=f'Film {i}', price=price + (i % 5) * 5000, status='now', showtime='19:00') for i in range(count)]
+        bioskop.db.session.execute(insert(bioskop.Movie), rows)
+        bioskop.db.session.commit()
+        return bioskop.db.session.execute(select(bioskop.Movie.id)).scalars().all()
+
+
+def seed_bookings(bioskop, movie_ids, user_ids, count, days=365, chunk=50000, seed=7):
+    """Isi `count` booking lama (status 'history') tersebar di `days` hari terakhir.
+
+    Pakai executemany langsung di koneksi DBAPI supaya jutaan baris tetap cepat.
+    Order dan rollup penjualan dibuat sesudahnya (backfill_orders + rebuild_sales_rollups),
+    sama seperti migrasi data lama, supaya dashboard/laporan tidak membaca rollup kosong.
+    """
+    import random
+    from datetime import timedelta
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    with bioskop.app.app_context():
+        raw = bioskop.db.engine.raw_connection()
+        try:
+            cur = raw.cursor()
+            for offset in range(0, count, chunk):
+                rows = []
+                for _ in range(min(chunk, count - offset)):
+                    when = now - timedelta(seconds=rng.randrange(days * 86400))
+                    rows.append((rng.choice(user_ids), rng.choice(movie_ids), 'A%d' % rng.randint(1, 6),
+                                 when.strftime('%Y-%m-%d %H:%M:%S.000000'), 'history'))
+                cur.executemany('INSERT INTO booking (user_id, movie_id, seat_number, booking_date, status) '
+                                'VALUES (?, ?, ?, ?, ?)', rows)
+                raw.commit()
+        finally:
+            raw.close()
+        bioskop.backfill_orders()
+        bioskop.db.session.commit()
+        bioskop.rebuild_sales_rollups()
+
+
+def busiest_day(bioskop):
+    """Tanggal (YYYY-MM-DD) dengan order terbanyak, untuk benchmark dashboard/laporan harian."""
+    from sqlalchemy import func, select
+    with bioskop.app.app_context():
+        day = bioskop.db.session.execute(select(bioskop.DailySales.day).group_by(bioskop.DailySales.day)
+                                         .order_by(func.sum(bioskop.DailySales.tickets).desc()).limit(1)).scalar()
+        return day.isoformat() if day else None
+
+
+def check_admin_totals(client, day):
+    """Pastikan /admin?date=day menampilkan total tiket dan penjualan harian > 0 (rollup terisi)."""
+    import re
+    html = client.get(f'/admin?date={day}').get_data(as_text=True)
+    total = re.search(r'<div class="stat-number">(\d+)</div>', html)
+    daily = re.search(r'Total Pendapatan Harian \((\d+) tiket\)', html)
+    if not total or not daily or int(total.group(1)) == 0 or int(daily.group(1)) == 0:
+        raise SystemExit(f'/admin?date={day} menampilkan total 0: rollup penjualan kosong')
+
+
+def time_requests(client, url, repeat):
+    """Latency (ms) dari `repeat` kali GET url, gagal jika status bukan 200."""
+    import time
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = client.get(url)
+        samples.append((time.perf_counter() - t0) * 1000)
+        if res.status_code != 200:
+            raise SystemExit(f'GET {url} -> {res.status_code}')
+    return samples
@@ -0,0 +1,44 @@
+"""Benchmark halaman riwayat tiket untuk user dengan banyak booking.
+
+Satu user 'pelanggan berat' diisi banyak booking, lalu latency halaman pertama
+/history dan halaman /history/page di tengah-tengah riwayat diukur. Dengan
+keyset pagination keduanya harus kurang lebih sama, berapa pun jumlah booking.
+
+    python tests/bench_history.py --bookings 200000
+"""
+import argparse
+import json
+
+import bench_common
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bookings', type=int, default=200000)
+    parser.add_argument('--movies', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    bioskop = bench_common.load_app()
+    user_ids = bench_common.seed_users(bioskop, 2)
+    movie_ids = bench_common.seed_movies(bioskop, args.movies)
+    bench_common.seed_bookings(bioskop, movie_ids, user_ids[:1], args.bookings)
+
+    with bioskop.app.app_context():
+        # cursor kira-kira di tengah riwayat
+        cursor = None
+        for _ in range(args.bookings // (2 * bioskop.HISTORY_PER_PAGE)):
+            _, cursor = bioskop.history_page(user_ids[0], cursor)
+            if cursor is None: break
+        middle = bioskop.encode_cursor(cursor)
+
+    client = bench_common.client_for(bioskop, user_ids[0])
+    first = bench_common.time_requests(client, '/history', args.repeat)
+    deep = bench_common.time_requests(client, f'/history/page?cursor={middle}', args.repeat)
+    print(json.dumps({'benchmark': 'history', 'timestamp': bench_common.stamp(), 'bookings': args.bookings,
+                      'first_page': bench_common.latency_summary(first),
+                      'middle_page_json': bench_common.latency_summary(deep)}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark latency booking saat banjir login (credential stuffing).
+
+Fase 1: thread booking saja (baseline). Fase 2: booking + thread yang terus
+POST /login dengan password salah, dari satu IP atau dari IP acak. Dengan
+limiter dan pool hashing terbatas, latency booking di fase 2 harus tetap dekat
+baseline. --no-limits mematikan limiter dan memperbesar pool sebagai pembanding.
+
+    python tests/bench_login_flood.py --booking-threads 4 --flood-threads 16 --duration 10
+    python tests/bench_login_flood.py --booking-threads 4 --flood-threads 16 --duration 10 --no-limits
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+
+import bench_common
+
+SEATS = [row + str(col) for row in 'ABCDE' for col in range(1, 7)]
+
+
+def run_phase(bioskop, args, user_ids, movie_ids, flood):
+    stop = threading.Event()
+    booking_ms = []
+    login = Counter()
+    lock = threading.Lock()
+
+    def booker(index):
+        rng = random.Random(index)
+        client = bench_common.client_for(bioskop, user_ids[index])
+        while not stop.is_set():
+            movie_id = rng.choice(movie_ids)
+            t0 = time.perf_counter()
+            client.get(f'/movie/{movie_id}/seats')
+            client.post('/book_ticket', json={'movie_id': movie_id, 'seats': rng.sample(SEATS, 2)})
+            with lock: booking_ms.append((time.perf_counter() - t0) * 1000)
+
+    def flooder(index):
+        rng = random.Random(1000 + index)
+        client = bioskop.app.test_client()
+        while not stop.is_set():
+            ip = f'10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}' if args.random_ips else '10.0.0.1'
+            res = client.post('/login', data={'username': f'bench_{rng.randrange(len(user_ids))}', 'password': 'tebakan'},
+                              environ_base={'REMOTE_ADDR': ip})
+            with lock: login[res.status_code] += 1
+
+    threads = [threading.Thread(target=booker, args=(i,)) for i in range(args.booking_threads)]
+    if flood: threads += [threading.Thread(target=flooder, args=(i,)) for i in range(args.flood_threads)]
+    for t in threads: t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads: t.join()
+    result = {'booking': bench_common.latency_summary(booking_ms)}
+    if flood:
+        result['login_responses'] = {str(k): v for k, v in sorted(login.items())}
+        result['login_rps'] = round(sum(login.values()) / args.duration, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--booking-threads', type=int, default=4)
+    parser.add_argument('--flood-threads', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--movies', type=int, default=200)
+    parser.add_argument('--random-ips', action='store_true', help='tiap request login dari IP acak (lolos limiter IP)')
+    parser.add_argument('--no-limits', action='store_true', help='tanpa limiter, pool hashing selebar jumlah flooder')
+    args = parser.parse_args()
+
+    if args.no_limits:
+        os.environ.update(LOGIN_IP_BURST='1000000000', LOGIN_USER_BURST='1000000000',
+                          HASH_WORKERS=str(args.flood_threads), HASH_QUEUE_LIMIT=str(args.flood_threads))
+    bioskop = bench_common.load_app()
+    user_ids = bench_common.seed_users(bioskop, 500)
+    with bioskop.app.app_context():
+        # password asli supaya percobaan login benar-benar diverifikasi (bukan user tidak ditemukan)
+        from sqlalchemy import update
+        bioskop.db.session.execute(update(bioskop.User).values(password=bioskop.generate_password_hash('rahasia', bioskop.password_method())))
+        bioskop.db.session.commit()
+    movie_ids = bench_common.seed_movies(bioskop, args.movies)
+
+    baseline = run_phase(bioskop, args, user_ids, movie_ids, flood=False)
+    flood = run_phase(bioskop, args, user_ids, movie_ids, flood=True)
+    print(json.dumps({'benchmark': 'login_flood', 'timestamp': bench_common.stamp(),
+                      'limits': not args.no_limits, 'random_ips': args.random_ips,
+                      'hash_iterations': bioskop.app.config['PASSWORD_HASH_ITERATIONS'],
+                      'hash_workers': bioskop.app.config['HASH_WORKERS'],
+                      'baseline': baseline, 'flood': flood,
+                      'booking_p95_ratio': round(flood['booking']['p95_ms'] / baseline['booking']['p95_ms'], 2)}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
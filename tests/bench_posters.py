@@ -0,0 +1,68 @@
+"""Benchmark ukuran payload halaman katalog: poster asli vs thumbnail WebP.
+
+Mengisi katalog dengan poster JPEG ukuran penuh, lalu menjumlah byte semua
+gambar yang dirujuk halaman / sebelum dan sesudah varian thumbnail dibuat.
+
+    python tests/bench_posters.py --movies 40
+"""
+import argparse
+import io
+import json
+import os
+import re
+import tempfile
+import time
+
+import bench_common
+
+
+def poster_bytes(rng, Image, width=1200, height=1800):
+    """JPEG berisi noise + gradasi, supaya ukurannya mirip foto poster asli."""
+    image = Image.effect_noise((width // 4, height // 4), 40).convert('RGB').resize((width, height))
+    image = Image.blend(image, Image.linear_gradient('L').convert('RGB').resize((width, height)), 0.5)
+    image = Image.blend(image, Image.new('RGB', (width, height), tuple(rng.randrange(256) for _ in range(3))), 0.3)
+    buf = io.BytesIO()
+    image.save(buf, 'JPEG', quality=90)
+    return buf.getvalue()
+
+
+def catalog_payload(client):
+    html = client.get('/').data
+    urls = re.findall(rb'<img src="(/media/[^"]+)"', html)
+    return len(html) + sum(len(client.get(url.decode()).data) for url in urls), len(urls)
+
+
+def main():
+    import random
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=40)
+    args = parser.parse_args()
+
+    bioskop = bench_common.load_app()
+    if bioskop.Image is None:
+        raise SystemExit('Pillow belum terpasang (pip install pillow)')
+    bioskop.app.config['UPLOAD_FOLDER'] = tempfile.mkdtemp(prefix='bioskop_posters_')
+    rng = random.Random(5)
+    with bioskop.app.test_request_context():
+        for i in range(args.movies):
+            path = os.path.join(bioskop.app.config['UPLOAD_FOLDER'], f'{i:020x}.jpg')
+            with open(path, 'wb') as f:
+                f.write(poster_bytes(rng, bioskop.Image))
+            bioskop.db.session.add(bioskop.Movie(title=f'Film {i}', price=50000, status='now', image=os.path.basename(path)))
+        bioskop.db.session.commit()
+    client = bench_common.client_for(bioskop, 1)
+    before, images = catalog_payload(client)
+
+    t0 = time.perf_counter()
+    with bioskop.app.app_context():
+        names = [m.image for m in bioskop.Movie.query.all()]
+    list(bioskop.background.map(bioskop.make_poster_variants, names))
+    build_s = time.perf_counter() - t0
+    after, _ = catalog_payload(client)
+    print(json.dumps({'benchmark': 'posters', 'timestamp': bench_common.stamp(), 'movies': args.movies, 'images': images,
+                      'catalog_bytes_original': before, 'catalog_bytes_thumbnails': after,
+                      'reduction': round(before / after, 1), 'variants_build_s': round(build_s, 2)}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
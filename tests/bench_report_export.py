@@ -0,0 +1,56 @@
+"""Benchmark memori ekspor CSV /admin/download_report.
+
+Ekspor rentang 1 bulan dan 1 tahun lalu bandingkan puncak alokasi memori
+Python (tracemalloc). Dengan streaming, puncaknya harus kurang lebih sama.
+
+    python tests/bench_report_export.py --bookings 500000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import bench_common
+
+
+def export(client, url):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    response = client.get(url, buffered=False)
+    size = sum(len(chunk) for chunk in response.response)
+    response.close()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'bytes': size, 'seconds': round(elapsed, 2), 'peak_mem_kb': round(peak / 1024)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=50)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--bookings', type=int, default=500000)
+    args = parser.parse_args()
+
+    bioskop = bench_common.load_app()
+    movie_ids = bench_common.seed_movies(bioskop, args.movies)
+    user_ids = bench_common.seed_users(bioskop, args.users)
+    bench_common.seed_bookings(bioskop, movie_ids, user_ids, args.bookings, days=365)
+    with bioskop.app.app_context():
+        bioskop.rebuild_sales_rollups()
+
+    client = bench_common.client_for(bioskop, user_ids[0], username='admin')
+    today = date.today()
+    results = {}
+    for label, days in (('month', 30), ('year', 366)):
+        start = (today - timedelta(days=days - 1)).isoformat()
+        results[label] = export(client, f'/admin/download_report?start={start}&end={today.isoformat()}')
+        results[label + '_gzip'] = export(client, f'/admin/download_report?start={start}&end={today.isoformat()}&gzip=1')
+
+    print(json.dumps({'benchmark': 'report_export', 'timestamp': bench_common.stamp(),
+                      'bookings': args.bookings, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
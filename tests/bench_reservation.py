@@ -0,0 +1,90 @@
+"""Benchmark kontensi reservasi kursi di /book_ticket.
+
+Banyak thread berebut kursi di satu jadwal tayang yang sama, lalu dilaporkan
+throughput, jumlah konflik, dan jumlah double booking (harus 0).
+
+    python tests/bench_reservation.py --threads 32 --attempts 40
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+
+import bench_common
+
+SEATS = [row + str(col) for row in 'ABCDE' for col in range(1, 7)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--attempts', type=int, default=40, help='request per thread')
+    parser.add_argument('--max-seats', type=int, default=4, help='kursi maksimum per request')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    bioskop = bench_common.load_app()
+    user_ids = bench_common.seed_users(bioskop, args.threads)
+    movie_id = bench_common.seed_movie(bioskop)
+
+    rng = random.Random(args.seed)
+    plans = [[rng.sample(SEATS, rng.randint(1, args.max_seats)) for _ in range(args.attempts)] for _ in user_ids]
+    confirmed = Counter()
+    stats = Counter()
+    latencies = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(len(user_ids))
+
+    def worker(user_id, plan):
+        client = bench_common.client_for(bioskop, user_id)
+        start_gate.wait()
+        for seats in plan:
+            t0 = time.perf_counter()
+            res = client.post('/book_ticket', json={'movie_id': movie_id, 'seats': seats})
+            elapsed = (time.perf_counter() - t0) * 1000
+            body = res.get_json() or {}
+            with lock:
+                latencies.append(elapsed)
+                stats[body.get('status', 'http_%d' % res.status_code)] += 1
+                if body.get('status') == 'success':
+                    confirmed.update(body['seats'])
+
+    threads = [threading.Thread(target=worker, args=(uid, plan)) for uid, plan in zip(user_ids, plans)]
+    t0 = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.perf_counter() - t0
+
+    with bioskop.app.app_context():
+        from sqlalchemy import func, select
+        Booking = bioskop.Booking
+        dup_rows = bioskop.db.session.execute(
+            select(Booking.seat_number).where(Booking.movie_id == movie_id, Booking.status == 'booked')
+            .group_by(Booking.seat_number).having(func.count() > 1)).all()
+        booked = bioskop.db.session.execute(
+            select(func.count()).select_from(Booking).where(Booking.movie_id == movie_id, Booking.status == 'booked')).scalar()
+
+    double_booked = len(dup_rows) + sum(1 for n in confirmed.values() if n > 1)
+    total = sum(stats.values())
+    report = {
+        'benchmark': 'reservation',
+        'timestamp': bench_common.stamp(),
+        'threads': args.threads,
+        'requests': total,
+        'wall_s': round(wall, 3),
+        'throughput_rps': round(total / wall, 1),
+        'latency': bench_common.latency_summary(latencies),
+        'responses': dict(stats),
+        'seats_booked': booked,
+        'seats_confirmed': sum(confirmed.values()),
+        'double_booked': double_booked,
+    }
+    print(json.dumps(report, indent=2))
+    if double_booked or booked != sum(confirmed.values()):
+        raise SystemExit('GAGAL: ada kursi yang terjual lebih dari sekali')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark cache katalog + index pencarian film.
+
+Mengisi katalog dengan banyak judul acak, lalu mengukur waktu bangun index
+dan latency pencarian (langsung ke index dan lewat halaman /?q=).
+
+    python tests/bench_search.py --movies 100000
+"""
+import argparse
+import json
+import random
+import time
+
+import bench_common
+
+COMMON = ('malam sang kota rumah cinta perang bintang laut hantu raja naga rahasia terakhir kembali petualangan '
+          'dunia jalan pulang merah hitam api angin hujan senja pagi kisah legenda misteri pulau hutan').split()
+SYLLABLES = 'ba ka la ma na pa ra sa ta da ga ja wa ya ri ku mu ni lo te be se de ko'.split()
+
+
+def vocabulary(rng, size=5000):
+    """Kata umum + kata acak dari suku kata, supaya sebaran kata mirip katalog sungguhan."""
+    words = set(COMMON)
+    while len(words) < size:
+        words.add(''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+QUERIES = ['rumah', 'naga', 'rahasia malam', 'pet', 'la', 'legenda pulau', 'xyz', 'kembali ke kota', 'senja merah']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    bioskop = bench_common.load_app()
+    rng = random.Random(3)
+    words = vocabulary(rng)
+    from sqlalchemy import insert
+    with bioskop.app.app_context():
+        rows = [dict(title=' '.join(rng.sample(words, rng.randint(1, 4))).title() + f' {i}', price=50000,
+                     description=' '.join(rng.choices(words, k=12)), status=rng.choice(['now', 'soon']))
+                for i in range(args.movies)]
+        bioskop.db.session.execute(insert(bioskop.Movie), rows)
+        bioskop.db.session.commit()
+
+        t0 = time.perf_counter()
+        catalog = bioskop.catalog_cache.get()
+        build_s = time.perf_counter() - t0
+
+        per_query = {}
+        for q in QUERIES:
+            samples = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                hits = catalog.index.search(q)
+                samples.append((time.perf_counter() - t0) * 1000)
+            per_query[q] = dict(bench_common.latency_summary(samples), hits=len(hits))
+
+    client = bench_common.client_for(bioskop, 1)
+    page = bench_common.time_requests(client, '/?q=rahasia+malam', args.repeat)
+    all_samples = [v['p50_ms'] for v in per_query.values()]
+    print(json.dumps({'benchmark': 'search', 'timestamp': bench_common.stamp(), 'movies': args.movies,
+                      'index_build_s': round(build_s, 2), 'search_p50_worst_ms': max(all_samples),
+                      'queries': per_query, 'home_search_page': bench_common.latency_summary(page)}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
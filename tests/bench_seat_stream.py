@@ -0,0 +1,117 @@
+"""Load test stream SSE peta kursi (/movie/<id>/seats/stream).
+
+Membuka banyak koneksi SSE idle ke server lokal, lalu melakukan booking dan
+mengukur latency dari commit sampai event diterima setiap klien.
+
+    python tests/bench_seat_stream.py --clients 2000 --bookings 20
+"""
+import argparse
+import json
+import logging
+import resource
+import selectors
+import socket
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+import bench_common
+
+
+def raise_fd_limit(wanted):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+
+def open_stream(port, path, cookie):
+    sock = socket.create_connection(('127.0.0.1', port))
+    sock.sendall((f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: text/event-stream\r\n'
+                  f'Cookie: session={cookie}\r\n\r\n').encode())
+    sock.setblocking(False)
+    return sock
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--bookings', type=int, default=20)
+    parser.add_argument('--interval', type=float, default=0.2, help='jeda antar booking (detik)')
+    args = parser.parse_args()
+    raise_fd_limit(args.clients * 2 + 256)
+
+    bioskop = bench_common.load_app()
+    user_id = bench_common.seed_users(bioskop, 1)[0]
+    movie_id = bench_common.seed_movie(bioskop)
+    with bioskop.app.app_context():
+        studio = bioskop.Studio(name='Bench', rows=20, cols=max(6, args.bookings))
+        bioskop.db.session.add(studio)
+        bioskop.db.session.commit()
+        bioskop.db.session.get(bioskop.Movie, movie_id).studio_id = studio.id
+        bioskop.db.session.commit()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, bioskop.app, threaded=True)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cookie = bioskop.app.session_interface.get_signing_serializer(bioskop.app).dumps(
+        {'user_id': user_id, 'username': 'bench_0'})
+
+    sel = selectors.DefaultSelector()
+    path = f'/movie/{movie_id}/seats/stream'
+    t0 = time.perf_counter()
+    for _ in range(args.clients):
+        sel.register(open_stream(server.port, path, cookie), selectors.EVENT_READ, data=bytearray())
+    latencies = []
+    ready = 0
+    deadline = time.time() + 30
+
+    def pump(timeout):
+        nonlocal ready
+        for key, _ in sel.select(timeout):
+            chunk = key.fileobj.recv(65536)
+            now = time.time()
+            buf = key.data
+            buf += chunk
+            while b'\n\n' in buf:
+                event, _, rest = bytes(buf).partition(b'\n\n')
+                buf[:] = rest
+                for line in event.split(b'\n'):
+                    if line.startswith(b'event: ready'):
+                        ready += 1
+                    elif line.startswith(b'data: {"type"'):
+                        latencies.append((now - json.loads(line[6:])['ts']) * 1000)
+
+    while ready < args.clients and time.time() < deadline:
+        pump(0.5)
+    connect_s = time.perf_counter() - t0
+
+    client = bench_common.client_for(bioskop, user_id)
+    booker = threading.Thread(target=lambda: [
+        (client.post('/book_ticket', json={'movie_id': movie_id, 'seats': [f'A{i + 1}']}), time.sleep(args.interval))
+        for i in range(args.bookings)])
+    booker.start()
+    expected = args.clients * args.bookings
+    deadline = time.time() + args.bookings * args.interval + 30
+    while len(latencies) < expected and time.time() < deadline:
+        pump(0.2)
+    booker.join()
+
+    report = {
+        'benchmark': 'seat_stream',
+        'timestamp': bench_common.stamp(),
+        'clients': args.clients,
+        'connected': ready,
+        'connect_s': round(connect_s, 3),
+        'bookings': args.bookings,
+        'events_expected': expected,
+        'events_delivered': len(latencies),
+        'delivery_latency': bench_common.latency_summary(latencies),
+    }
+    print(json.dumps(report, indent=2))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
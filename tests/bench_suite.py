@@ -0,0 +1,191 @@
+"""Benchmark campuran jalur utama: home, detail film, halaman kursi, booking, dashboard admin, laporan CSV.
+
+Database lokal diisi sesuai skala (film, user, booking lama), lalu beberapa
+thread menjalankan request campuran secara bersamaan selama --duration detik.
+Hasilnya JSON (latency p50/p95/p99 per route, throughput, error rate, konflik
+dan double booking) supaya bisa dibandingkan antar rilis lewat --compare.
+
+    python tests/bench_suite.py --movies 200 --users 1000 --bookings 200000 --threads 16 --duration 30 --out bench.json
+    python tests/bench_suite.py ... --compare bench.json --max-regression 1.25
+"""
+import argparse
+import json
+import random
+import subprocess
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+import bench_common
+
+SEATS = [row + str(col) for row in 'ABCDE' for col in range(1, 7)]
+DEFAULT_MIX = 'home=35,detail=20,seats=15,book=20,admin=5,report=5'
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ('home', 'detail', 'seats', 'book', 'admin', 'report'):
+            raise argparse.ArgumentTypeError(f'route tidak dikenal: {name}')
+        mix[name] = float(weight)
+    return mix
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=bench_common.ROOT, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline, max_regression):
+    """Rasio p95 dan throughput per route terhadap hasil sebelumnya; route yang melambat > max_regression ditandai."""
+    result, regressions = {}, []
+    for name, route in report['routes'].items():
+        old = baseline.get('routes', {}).get(name)
+        if not old or not old['latency']['p95_ms']: continue
+        p95_ratio = round(route['latency']['p95_ms'] / old['latency']['p95_ms'], 2)
+        rps_ratio = round(route['throughput_rps'] / old['throughput_rps'], 2) if old['throughput_rps'] else None
+        result[name] = {'p95_ratio': p95_ratio, 'throughput_ratio': rps_ratio}
+        if max_regression and p95_ratio > max_regression: regressions.append(name)
+    return {'baseline_revision': baseline.get('revision'), 'routes': result, 'regressions': regressions}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movies', type=int, default=200)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--bookings', type=int, default=100000, help='booking lama (history) untuk isi database')
+    parser.add_argument('--days', type=int, default=90, help='sebaran hari booking lama')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20.0, help='detik')
+    parser.add_argument('--hot-movies', type=int, default=5, help='film yang diperebutkan di /book_ticket')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', help='tulis JSON ke file ini (selain stdout)')
+    parser.add_argument('--compare', help='JSON hasil sebelumnya untuk dibandingkan')
+    parser.add_argument('--max-regression', type=float, default=None, help='gagal jika p95 route > rasio ini')
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    bioskop = bench_common.load_app()
+    user_ids = bench_common.seed_users(bioskop, max(args.users, args.threads))
+    movie_ids = bench_common.seed_movies(bioskop, args.movies)
+    if args.bookings:
+        bench_common.seed_bookings(bioskop, movie_ids, user_ids, args.bookings, days=args.days)
+        # route admin/report harus mengukur dashboard dan laporan yang berisi, bukan rollup kosong
+        admin = bench_common.client_for(bioskop, user_ids[0], username='admin')
+        day = bench_common.busiest_day(bioskop)
+        bench_common.check_admin_totals(admin, day)
+        if len(admin.get(f'/admin/download_report?date={day}').get_data(as_text=True).splitlines()) < 3:
+            raise SystemExit(f'laporan {day} kosong')
+    seed_s = time.perf_counter() - t0
+    hot = movie_ids[:args.hot_movies]
+    today = date.today()
+
+    names, weights = zip(*args.mix.items())
+    latencies = defaultdict(list)
+    outcomes = defaultdict(Counter)
+    confirmed = Counter()
+    lock = threading.Lock()
+    start_gate = threading.Barrier(args.threads)
+
+    def worker(index):
+        rng = random.Random(args.seed + index)
+        client = bench_common.client_for(bioskop, user_ids[index])
+        admin = bench_common.client_for(bioskop, user_ids[index], username='admin')
+        start_gate.wait()
+        deadline = time.perf_counter() + args.duration
+        while time.perf_counter() < deadline:
+            route = rng.choices(names, weights)[0]
+            seats = movie_id = None
+            t = time.perf_counter()
+            if route == 'home':
+                res = client.get('/')
+            elif route == 'detail':
+                res = client.get(f'/movie/details/{rng.choice(movie_ids)}')
+            elif route == 'seats':
+                # halaman pilih kursi film yang diperebutkan lalu denah kursinya, seperti browser
+                movie_id = rng.choice(hot)
+                page = client.get(f'/movie/{movie_id}')
+                res = client.get(f'/movie/{movie_id}/seats')
+                if page.status_code != 200: res = page
+            elif route == 'book':
+                movie_id, seats = rng.choice(hot), rng.sample(SEATS, rng.randint(1, 3))
+                res = client.post('/book_ticket', json={'movie_id': movie_id, 'seats': seats})
+            elif route == 'admin':
+                res = admin.get(f'/admin?date={today - timedelta(days=rng.randrange(args.days))}')
+            else:
+                res = admin.get(f'/admin/download_report?date={today - timedelta(days=rng.randrange(args.days))}')
+            body = res.data # laporan di-stream: ukur sampai byte terakhir
+            elapsed = (time.perf_counter() - t) * 1000
+            if route == 'book':
+                status = (res.get_json(silent=True) or {}).get('status')
+                outcome = status if res.status_code in (200, 409) and status in ('success', 'conflict') else 'error'
+            else:
+                outcome = 'ok' if res.status_code == 200 and body else 'error'
+            with lock:
+                latencies[route].append(elapsed)
+                outcomes[route][outcome] += 1
+                if outcome == 'success': confirmed.update((movie_id, seat) for seat in seats)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    t0 = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.perf_counter() - t0
+
+    with bioskop.app.app_context():
+        from sqlalchemy import func, select
+        Booking = bioskop.Booking
+        duplicates = bioskop.db.session.execute(
+            select(func.count()).select_from(select(Booking.movie_id, Booking.seat_number).where(Booking.status == 'booked')
+                                             .group_by(Booking.movie_id, Booking.seat_number).having(func.count() > 1).subquery())).scalar()
+        booked = bioskop.db.session.execute(select(func.count()).select_from(Booking).where(Booking.status == 'booked')).scalar()
+
+    routes = {}
+    for route in names:
+        count = sum(outcomes[route].values())
+        routes[route] = {'requests': count, 'throughput_rps': round(count / wall, 1),
+                         'errors': outcomes[route]['error'], 'error_rate': round(outcomes[route]['error'] / count, 4) if count else 0.0,
+                         'outcomes': dict(outcomes[route]), 'latency': bench_common.latency_summary(latencies[route])}
+    total = sum(r['requests'] for r in routes.values())
+    errors = sum(r['errors'] for r in routes.values())
+    bookings = outcomes['book']
+    attempts = bookings['success'] + bookings['conflict']
+    double_booked = duplicates + sum(1 for n in confirmed.values() if n > 1)
+    report = {
+        'benchmark': 'suite',
+        'timestamp': bench_common.stamp(),
+        'revision': git_revision(),
+        'config': {k: v for k, v in vars(args).items() if k not in ('out', 'compare', 'max_regression')},
+        'seed_s': round(seed_s, 1),
+        'wall_s': round(wall, 3),
+        'requests': total,
+        'throughput_rps': round(total / wall, 1),
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'routes': routes,
+        'booking': {'seats_confirmed': sum(confirmed.values()), 'seats_booked': booked, 'double_booked': double_booked,
+                    'conflict_rate': round(bookings['conflict'] / attempts, 4) if attempts else 0.0},
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            report['compare'] = compare(report, json.load(f), args.max_regression)
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+    if double_booked or booked != sum(confirmed.values()):
+        raise SystemExit('GAGAL: ada kursi yang terjual lebih dari sekali')
+    if errors:
+        raise SystemExit(f'GAGAL: {errors} request error')
+    if report.get('compare', {}).get('regressions'):
+        raise SystemExit(f"GAGAL: p95 melambat di {', '.join(report['compare']['regressions'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Benchmark skala throughput route baca (home, detail film) terhadap jumlah worker.
+
+Seperti gunicorn: satu socket listen dibuka di proses induk, lalu N proses
+worker (fork, app dimuat lewat create_app dengan SHARED_STATE=database) menerima
+koneksi dari socket yang sama. Beban dikirim dari proses klien terpisah dengan
+koneksi HTTP keep-alive. Hasilnya JSON: rps per jumlah worker, speedup dan
+efisiensi (speedup / N). Skala hanya mungkin linear jika core cukup untuk worker
+dan klien; cpu_count ikut dicatat. Hanya Linux/macOS (butuh fork).
+
+    python tests/bench_workers.py --workers 1,2,4 --clients 4 --duration 10
+    python tests/bench_workers.py --workers 1,4 --min-efficiency 0.8
+"""
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+
+import bench_common
+
+READ_ROUTES = ('/', '/movie/details/{movie_id}')
+
+
+def serve(bioskop, sock):
+    """Proses worker: engine hasil fork dibuang dulu (koneksi SQLite tidak boleh dibagi antar proses)."""
+    from werkzeug.serving import make_server
+    logging.getLogger('werkzeug').setLevel(logging.WARNING) # access log per request ikut memakan CPU
+    with bioskop.app.app_context():
+        bioskop.db.engine.dispose(close=False)
+    app = bioskop.create_app(SHARED_STATE='database', HOLD_SWEEPER=False)
+    make_server('127.0.0.1', sock.getsockname()[1], app, threaded=True, fd=sock.fileno()).serve_forever()
+
+
+def load(port, cookie, movie_ids, threads, duration, seed, results):
+    """Proses klien: `threads` koneksi keep-alive, GET route baca acak selama `duration` detik."""
+    deadline = time.perf_counter() + duration
+    lock = threading.Lock()
+    total = {'ok': 0, 'errors': 0, 'latency_ms': []}
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        ok = errors = 0
+        samples = []
+        while time.perf_counter() < deadline:
+            path = rng.choice(READ_ROUTES).format(movie_id=rng.choice(movie_ids))
+            t0 = time.perf_counter()
+            try:
+                conn.request('GET', path, headers={'Cookie': cookie})
+                res = conn.getresponse()
+                res.read()
+                if res.status == 200: ok += 1
+                else: errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            samples.append((time.perf_counter() - t0) * 1000)
+        conn.close()
+        with lock:
+            total['ok'] += ok
+            total['errors'] += errors
+            total['latency_ms'] += samples
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool: t.start()
+    for t in pool: t.join()
+    results.put(total)
+
+
+def wait_ready(port, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/healthz')
+            if conn.getresponse().status == 200: return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit('worker tidak siap dalam %ds' % timeout)
+
+
+def run(ctx, bioskop, workers, args, cookie, movie_ids):
+    sock = socket.create_server(('127.0.0.1', 0), backlog=1024)
+    port = sock.getsockname()[1]
+    procs = [ctx.Process(target=serve, args=(bioskop, sock), daemon=True) for _ in range(workers)]
+    for p in procs: p.start()
+    try:
+        wait_ready(port)
+        # pemanasan: isi cache katalog di setiap worker
+        warm = ctx.Queue()
+        load(port, cookie, movie_ids, workers * 2, 1.0, 0, warm)
+        warm.get()
+
+        results = ctx.Queue()
+        clients = [ctx.Process(target=load, args=(port, cookie, movie_ids, args.threads, args.duration, i, results))
+                   for i in range(args.clients)]
+        for c in clients: c.start()
+        parts = [results.get() for _ in clients]
+        for c in clients: c.join()
+    finally:
+        for p in procs: p.terminate()
+        for p in procs: p.join()
+        sock.close()
+    ok = sum(p['ok'] for p in parts)
+    return {
+        'workers': workers,
+        'requests': ok,
+        'errors': sum(p['errors'] for p in parts),
+        'throughput_rps': round(ok / args.duration, 1),
+        'latency': bench_common.latency_summary([ms for p in parts for ms in p['latency_ms']]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', default='1,2,4', help='daftar jumlah worker, dipisah koma')
+    parser.add_argument('--clients', type=int, default=None, help='proses klien (default: jumlah worker terbesar)')
+    parser.add_argument('--threads', type=int, default=8, help='koneksi per proses klien')
+    parser.add_argument('--duration', type=float, default=10.0, help='detik per jumlah worker')
+    parser.add_argument('--movies', type=int, default=200)
+    parser.add_argument('--min-efficiency', type=float, default=None,
+                        help='gagal jika efisiensi di jumlah worker terbesar di bawah nilai ini')
+    args = parser.parse_args()
+    counts = sorted({int(n) for n in args.workers.split(',')})
+    args.clients = args.clients or counts[-1]
+
+    os.environ.setdefault('SECRET_KEY', 'bench-workers')
+    bioskop = bench_common.load_app(os.path.join(tempfile.mkdtemp(prefix='bioskop_bench_'), 'bench.db'))
+    with bioskop.app.app_context():
+        bioskop.migrate_database()
+    movie_ids = bench_common.seed_movies(bioskop, args.movies)
+    user_id = bench_common.seed_users(bioskop, 1)[0]
+    cookie = '%s=%s' % (bioskop.app.config['SESSION_COOKIE_NAME'],
+                        bioskop.app.session_interface.get_signing_serializer(bioskop.app).dumps(
+                            {'user_id': user_id, 'username': 'bench_0'}))
+
+    ctx = multiprocessing.get_context('fork')
+    runs = [run(ctx, bioskop, n, args, cookie, movie_ids) for n in counts]
+    base = runs[0]['throughput_rps'] / runs[0]['workers']
+    for r in runs:
+        r['speedup'] = round(r['throughput_rps'] / base, 2) if base else None
+        r['efficiency'] = round(r['speedup'] / r['workers'], 2) if base else None
+    report = {
+        'bench': 'workers',
+        'at': bench_common.stamp(),
+        'cpu_count': os.cpu_count(),
+        'clients': args.clients,
+        'threads_per_client': args.threads,
+        'duration_s': args.duration,
+        'routes': list(READ_ROUTES),
+        'runs': runs,
+    }
+    if counts[-1] + args.clients > (os.cpu_count() or 1):
+        report['warning'] = 'core lebih sedikit dari worker + klien; skala tidak bisa linear di mesin ini'
+    print(json.dumps(report, indent=2))
+    if args.min_efficiency is not None and runs[-1]['efficiency'] < args.min_efficiency:
+        raise SystemExit(f"efisiensi {runs[-1]['efficiency']} < {args.min_efficiency} pada {counts[-1]} worker")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,16 @@
+import io
+import os
+import time
 import unittest
-from app import app, db, User, Movie, Booking
+import unittest.mock
+from datetime import datetime, timedelta
+
+# pakai database in-memory, jangan sentuh bioskop.db
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+# hash murah untuk tes; hash 'pbkdf2:sha256' dari setUp ikut di-upgrade saat login
+os.environ.setdefault('PASSWORD_HASH_ITERATIONS', '1000')
+
+from app import app, db, User, Movie, Booking, SeatHold, Studio, hold_seats, held_seats, sweep_expired_holds, row_label, seat_index, seat_broker, admin_dashboard_data, DailySales, MovieSales, rebuild_sales_rollups, catalog_cache, SearchIndex, MovieCard, Rating, RatingStats, check_rating_stats, BookingArchive, archive_bookings, migrate_database, SchemaMigration, history_page, Order, make_poster_variants, poster_url, count_queries, enable_instrumentation, metrics, ip_limiter, user_limiter
 from sqlalchemy.exc import IntegrityError
 
 class BioskopUnitTest(unittest.TestCase):
@@ -10,6 +21,9 @@ class BioskopUnitTest(unittest.TestCase):
         app.config['WTF_CSRF_ENABLED'] = False
         
         self.app = app.test_client()
+        catalog_cache.invalidate()
+        ip_limiter.reset()
+        user_limiter.reset()
         
         with app.app_context():
             db.create_all()
@@ -47,6 +61,12 @@ class BioskopUnitTest(unittest.TestCase):
             password='123'
         ), follow_redirects=True)
 
+    def as_admin(self):
+        """Helper sesi admin ('admin' adalah username yang dicek route /admin)"""
+        with self.app.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['username'] = 'admin'
+
     # tes autentikasi (login berhasil)
     def test_login_berhasil(self):
         response = self.login_user()
@@ -81,6 +101,855 @@ class BioskopUnitTest(unittest.TestCase):
             count_a1 = Booking.query.filter_by(seat_number='A1').count()
             self.assertEqual(count_a1, 1)
 
+    # tes reservasi all-or-nothing (kursi konflik dilaporkan)
+    def test_booking_conflict_all_or_nothing(self):
+        self.login_user()
+
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1']})
+        response = self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'A2']})
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json['status'], 'conflict')
+        self.assertEqual(response.json['conflicts'], ['A1'])
+        with app.app_context():
+            self.assertEqual(Booking.query.filter_by(seat_number='A2').count(), 0)
+
+    # tes integritas (unique index kursi aktif)
+    def test_active_seat_unique_index(self):
+        with app.app_context():
+            db.session.add(Booking(movie_id=1, seat_number='B1', user_id=1, status='history'))
+            db.session.add(Booking(movie_id=1, seat_number='B1', user_id=1))
+            db.session.commit()
+
+            db.session.add(Booking(movie_id=1, seat_number='B1', user_id=2))
+            with self.assertRaises(IntegrityError):
+                db.session.commit()
+            db.session.rollback()
+
+    # tes hold kursi (kursi yang di-hold user lain tidak bisa dibeli)
+    def test_hold_blocks_other_buyer(self):
+        with app.app_context():
+            conflicts, _ = hold_seats(2, 1, ['C1', 'C2'])
+            self.assertEqual(conflicts, [])
+
+        self.login_user()
+        response = self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['C2']})
+        self.assertEqual(response.json['conflicts'], ['C2'])
+
+        response = self.app.get('/movie/1/seats')
+        self.assertEqual(response.json['held'], ['C1', 'C2'])
+
+    # tes hold dikonversi jadi booking saat bayar
+    def test_hold_converted_on_booking(self):
+        self.login_user()
+        response = self.app.post('/hold_seats', json={'movie_id': 1, 'seats': ['D1', 'D2']})
+        self.assertEqual(response.json['status'], 'success')
+
+        response = self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['D1', 'D2']})
+        self.assertEqual(response.json['status'], 'success')
+        with app.app_context():
+            self.assertEqual(SeatHold.query.count(), 0)
+            self.assertEqual(Booking.query.filter_by(movie_id=1, status='booked').count(), 2)
+
+    # tes waktu kadaluarsa hold
+    def test_hold_expiry_timing(self):
+        ttl = timedelta(seconds=app.config['SEAT_HOLD_SECONDS'])
+        t0 = datetime(2025, 1, 1, 19, 0, 0)
+        with app.app_context():
+            _, expires_at = hold_seats(1, 1, ['E1'], now=t0)
+            self.assertEqual(expires_at, t0 + ttl)
+
+            self.assertEqual(held_seats(1, now=t0 + ttl - timedelta(seconds=1)), ['E1'])
+            self.assertEqual(held_seats(1, now=t0 + ttl), [])
+
+            conflicts, _ = hold_seats(2, 1, ['E1'], now=t0 + ttl - timedelta(seconds=1))
+            self.assertEqual(conflicts, ['E1'])
+            conflicts, _ = hold_seats(2, 1, ['E1'], now=t0 + ttl + timedelta(seconds=1))
+            self.assertEqual(conflicts, [])
+
+    # tes sweeper hanya menghapus hold kadaluarsa
+    def test_sweep_expired_holds(self):
+        t0 = datetime(2025, 1, 1, 19, 0, 0)
+        ttl = timedelta(seconds=app.config['SEAT_HOLD_SECONDS'])
+        with app.app_context():
+            hold_seats(1, 1, ['A5', 'A6'], now=t0)
+            hold_seats(2, 1, ['B5'], now=t0 + ttl)
+
+            self.assertEqual(sweep_expired_holds(now=t0 + ttl + timedelta(seconds=1)), 2)
+            self.assertEqual([h.seat_number for h in SeatHold.query.all()], ['B5'])
+
+    # tes bitmap kursi ikut berubah saat booking dan reset
+    def test_seat_bitmap_updates(self):
+        import base64
+        self.as_admin()
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'B3']})
+
+        layout = self.app.get('/movie/1/seats').json
+        self.assertEqual(layout['rows'], ['A', 'B', 'C', 'D', 'E'])
+        self.assertEqual(layout['cols'], 6)
+        bits = base64.b64decode(layout['booked'])
+        self.assertEqual(len(bits), 4)
+        booked = [i for i in range(30) if bits[i >> 3] & (1 << (i & 7))]
+        self.assertEqual(booked, [0, 8])
+
+        self.app.get('/admin/reset_seats/1')
+        bits = base64.b64decode(self.app.get('/movie/1/seats').json['booked'])
+        self.assertEqual(bits, bytes(4))
+
+    # tes layout studio besar (300+ kursi)
+    def test_large_studio_layout(self):
+        with app.app_context():
+            studio = Studio(name='IMAX', rows=28, cols=12)
+            db.session.add(studio)
+            db.session.commit()
+            db.session.get(Movie, 1).studio_id = studio.id
+            db.session.commit()
+
+        self.login_user()
+        response = self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['AB12']})
+        self.assertEqual(response.json['status'], 'success')
+        response = self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['AC1']})
+        self.assertEqual(response.status_code, 400)
+
+        layout = self.app.get('/movie/1/seats').json
+        self.assertEqual(layout['rows'][-1], 'AB')
+        self.assertEqual(seat_index('AB12', 28, 12), 28 * 12 - 1)
+        self.assertEqual(row_label(26), 'AA')
+
+    # tes stream SSE menerima perubahan kursi setelah booking
+    def test_seat_stream_pushes_booking(self):
+        import json
+        self.login_user()
+        response = self.app.get('/movie/1/seats/stream')
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        chunks = iter(response.response)
+        self.assertIn('event: ready', next(chunks).decode())
+        self.assertEqual(seat_broker.subscriber_count(1), 1)
+
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['E5', 'E6']})
+        event = json.loads(next(chunks).decode().split('data: ', 1)[1])
+        self.assertEqual(event['type'], 'booked')
+        self.assertEqual(event['seats'], ['E5', 'E6'])
+
+        response.close()
+        self.assertEqual(seat_broker.subscriber_count(1), 0)
+
+    # tes event kursi hanya terkirim jika transaksinya commit
+    def test_seat_events_follow_transaction(self):
+        import app as bioskop
+        q = seat_broker.subscribe(1)
+        try:
+            with app.app_context():
+                bioskop.shared_state.publish(1, 'held', ['A1'])
+                db.session.rollback()
+                self.assertTrue(q.empty())
+                bioskop.shared_state.publish(1, 'held', ['A2'])
+                self.assertTrue(q.empty())
+                db.session.commit()
+                self.assertIn('"A2"', q.get_nowait())
+        finally:
+            seat_broker.unsubscribe(1, q)
+
+    # tes batas stream SSE per proses: sisanya 503, thread tetap tersedia untuk request biasa
+    def test_seat_stream_limit(self):
+        self.login_user()
+        limit, app.config['SSE_MAX_STREAMS'] = app.config['SSE_MAX_STREAMS'], 1
+        try:
+            response = self.app.get('/movie/1/seats/stream')
+            next(iter(response.response))
+            busy = self.app.get('/movie/1/seats/stream')
+            self.assertEqual(busy.status_code, 503)
+            self.assertIn('Retry-After', busy.headers)
+            response.close()
+            self.assertEqual(self.app.get('/healthz').status_code, 200)
+        finally:
+            app.config['SSE_MAX_STREAMS'] = limit
+
+    # tes fan-out broker (klien lambat diminta resync, bukan memblokir publisher)
+    def test_seat_broker_fanout(self):
+        import json
+        queues = [seat_broker.subscribe(99) for _ in range(3)]
+        seat_broker.publish(99, 'held', ['A1'])
+        for q in queues:
+            self.assertEqual(json.loads(q.get_nowait())['seats'], ['A1'])
+
+        for _ in range(seat_broker.queue_size + 1):
+            seat_broker.publish(99, 'held', ['A2'])
+        self.assertEqual(json.loads(queues[0].get_nowait())['type'], 'resync')
+        for q in queues: seat_broker.unsubscribe(99, q)
+        self.assertEqual(seat_broker.subscriber_count(99), 0)
+
+    # tes data dashboard admin (agregat per film, pendapatan harian, paging)
+    def test_admin_dashboard_aggregates(self):
+        self.login_user()
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'A2']})
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A3']})
+        today = datetime.now().strftime('%Y-%m-%d')
+
+        with app.app_context():
+            data = admin_dashboard_data(today, page=2, per_page=1)
+            self.assertEqual(data['chart_values'], [3])
+            self.assertEqual(data['daily_revenue'], 150000)
+            self.assertEqual((data['sales_count'], data['order_count']), (3, 2))
+            self.assertEqual((data['page'], data['pages']), (2, 2))
+            self.assertEqual([(sale.seats, sale.total) for sale in data['daily_sales']], [('A3', 50000)])
+
+        self.as_admin()
+        response = self.app.get(f'/admin?date={today}')
+        self.assertIn(b'150,000', response.data)
+
+    # tes rollup penjualan ikut booking, reset, dan rebuild
+    def test_sales_rollups(self):
+        self.login_user()
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'A2']})
+        with app.app_context():
+            rollup = db.session.get(MovieSales, (1, 'booked'))
+            self.assertEqual((rollup.tickets, rollup.revenue), (2, 100000))
+            daily = DailySales.query.filter_by(movie_id=1, status='booked').one()
+            self.assertEqual(daily.day, datetime.now().date())
+
+        self.as_admin()
+        report = self.app.get(f"/admin/download_report?date={datetime.now().strftime('%Y-%m-%d')}").data.decode('utf-8-sig')
+        self.assertIn(';GRAND TOTAL HARI INI;;100000;', report)
+
+        self.app.get('/admin/reset_seats/1')
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1']})
+        with app.app_context():
+            incremental = sorted((r.day, r.status, r.tickets, r.revenue) for r in DailySales.query.all())
+            self.assertEqual([r[1:] for r in incremental], [('booked', 1, 50000), ('history', 2, 100000)])
+
+            rebuild_sales_rollups()
+            rebuilt = sorted((r.day, r.status, r.tickets, r.revenue) for r in DailySales.query.all())
+            self.assertEqual(rebuilt, incremental)
+
+        self.app.get('/admin/delete_movie/1')
+        with app.app_context():
+            self.assertEqual(DailySales.query.count() + MovieSales.query.count(), 0)
+
+    # tes ekspor CSV rentang tanggal, filter film, dan gzip
+    def test_report_range_export(self):
+        import gzip
+        with app.app_context():
+            db.session.add(Movie(title='Film Lain', price=30000, status='now'))
+            db.session.commit()
+        self.login_user()
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'A2']})
+        self.app.post('/book_ticket', json={'movie_id': 2, 'seats': ['B1']})
+        today = datetime.now().date()
+        start = (today - timedelta(days=7)).isoformat()
+
+        self.as_admin()
+        response = self.app.get(f'/admin/download_report?start={start}&end={today.isoformat()}')
+        self.assertEqual(response.mimetype, 'text/csv')
+        report = response.data.decode('utf-8-sig')
+        self.assertEqual(report.count(';Film Test;A1, A2;100000;booked'), 1)
+        self.assertIn(';GRAND TOTAL PERIODE;;130000;', report)
+
+        response = self.app.get(f'/admin/download_report?start={start}&end={today.isoformat()}&movie_id=2&gzip=1')
+        self.assertEqual(response.mimetype, 'application/gzip')
+        report = gzip.decompress(response.data).decode('utf-8-sig')
+        self.assertNotIn('Film Test', report)
+        self.assertIn(';GRAND TOTAL PERIODE;;30000;', report)
+
+    # tes ekspor Parquet dan agregasi analitik
+    def test_analytics_export(self):
+        import tempfile
+        import app as bioskop
+        if bioskop.pa is None: self.skipTest('pyarrow belum terpasang')
+        self.login_user()
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'A2', 'A3']})
+        self.app.post('/rate_movie/1', data={'score': 4})
+
+        with app.app_context(), tempfile.TemporaryDirectory() as folder:
+            counts = bioskop.export_analytics(folder, batch_rows=2)
+            self.assertEqual(counts['bookings'], 3)
+            self.assertEqual(bioskop.pq.read_table(os.path.join(folder, 'bookings.parquet')).schema.field('price').type, bioskop.pa.int64())
+
+            summary = bioskop.analytics_summary(folder)
+            self.assertEqual(sum(row['revenue'] for row in summary['revenue_by_hour']), 150000)
+            self.assertEqual(summary['occupancy_by_movie'][0]['booked'], 3)
+            self.assertEqual(summary['occupancy_by_movie'][0]['occupancy'], 10.0)
+            self.assertEqual(summary['rating_distribution'][4], 1)
+
+    # tes tombol ekspor: job dikirim ke background, status tampil di halaman analitik
+    def test_analytics_export_background(self):
+        import tempfile
+        from unittest import mock
+        import app as bioskop
+        if bioskop.pa is None: self.skipTest('pyarrow belum terpasang')
+        self.as_admin()
+        folder, app.config['ANALYTICS_FOLDER'] = app.config['ANALYTICS_FOLDER'], tempfile.mkdtemp()
+        try:
+            with mock.patch.object(bioskop.background, 'submit') as submit:
+                self.assertEqual(self.app.post('/admin/analytics/export').status_code, 302)
+            (job, job_folder), _ = submit.call_args
+            self.assertIs(job, bioskop.run_analytics_export)
+            # database tes in-memory hanya terlihat dari thread ini, jadi job dijalankan langsung
+            self.assertEqual(job(job_folder)['bookings'], 0)
+            self.assertEqual(sorted(f for f in os.listdir(job_folder) if f.endswith('.tmp')), [])
+            page = self.app.get('/admin/analytics').get_data(as_text=True)
+            self.assertIn('Ekspor terakhir selesai', page)
+
+            bioskop.write_analytics_status(job_folder, state='running', started_at=datetime.now().isoformat())
+            with mock.patch.object(bioskop.background, 'submit') as submit:
+                self.app.post('/admin/analytics/export')
+            submit.assert_not_called()
+            self.assertIn('http-equiv="refresh"', self.app.get('/admin/analytics').get_data(as_text=True))
+            # status 'running' dari worker yang mati tidak mengunci tombol ekspor selamanya
+            bioskop.write_analytics_status(job_folder, state='running', started_at='2026-01-01T10:00:00')
+            self.assertEqual(bioskop.analytics_export_status(job_folder)['state'], 'error')
+        finally:
+            app.config['ANALYTICS_FOLDER'] = folder
+
+    # tes rating: hanya bentrok unique yang diulang, FK gagal / bentrok terus tidak berputar selamanya
+    def test_save_rating_retry_is_bounded(self):
+        from unittest import mock
+        import app as bioskop
+        with app.app_context():
+            db.session.execute(db.text('PRAGMA foreign_keys = ON'))
+            with self.assertRaises(IntegrityError):
+                bioskop.save_rating(1, 999, 4) # film tidak ada
+            db.session.rollback()
+            db.session.execute(db.text('PRAGMA foreign_keys = OFF'))
+
+            bioskop.save_rating(1, 1, 3)
+            # skor selalu berubah di antara SELECT dan UPDATE (compare-and-set gagal terus)
+            from sqlalchemy import false, update
+            with mock.patch.object(bioskop, 'update', side_effect=lambda model: update(model).where(false())):
+                with self.assertRaises(bioskop.RatingConflict):
+                    bioskop.save_rating(1, 1, 5)
+            db.session.rollback()
+            self.assertEqual(db.session.get(RatingStats, 1).total, 3)
+
+        self.login_user()
+        with mock.patch.object(bioskop, 'save_rating', side_effect=bioskop.RatingConflict):
+            self.assertEqual(self.app.post('/rate_movie/1', data={'score': 4}).status_code, 409)
+
+    # tes skor rating lama di luar 1-5: dilaporkan, dijepit migrasi, dan tidak membuat update 500
+    def test_legacy_out_of_range_ratings(self):
+        import app as bioskop
+        with app.app_context():
+            db.session.execute(db.text('INSERT INTO rating (user_id, movie_id, score) VALUES (1, 1, 9), (2, 1, 0)'))
+            db.session.commit()
+            check_rating_stats(fix=True)
+            self.assertEqual(check_rating_stats(), [1])
+            bioskop.clamp_rating_scores()
+            db.session.commit()
+            self.assertEqual(sorted(r.score for r in Rating.query.all()), [1, 5])
+            self.assertEqual(check_rating_stats(), [])
+
+            db.session.execute(db.text('UPDATE rating SET score = 0 WHERE user_id = 2'))
+            db.session.commit()
+            self.assertEqual(bioskop.save_rating(2, 1, 4), 0)
+            self.assertEqual(db.session.get(RatingStats, 1).hist_4, 1)
+
+    # tes index pencarian (judul di atas sinopsis, awalan kata pendek)
+    def test_search_index_ranking(self):
+        cards = [MovieCard(1, 'Dune: Part Two', 50000, None, 'Paul bersatu dengan Fremen', '19:00', 'now'),
+                 MovieCard(2, 'Pengabdi Setan', 40000, None, 'Horor keluarga di rumah tua', '21:00', 'now'),
+                 MovieCard(3, 'Rumah Dara', 40000, None, 'Teror di rumah terpencil', '20:00', 'soon')]
+        index = SearchIndex(cards)
+        self.assertEqual([c.id for c in index.search('rumah')], [3, 2])
+        self.assertEqual([c.id for c in index.search('DUNE two')], [1])
+        self.assertEqual([c.id for c in index.search('pe')], [2])
+        self.assertEqual([c.id for c in index.search('fremen paul')], [1])
+        self.assertEqual(index.search('zzz'), [])
+
+    # tes cache katalog diperbarui setelah tambah / hapus film
+    def test_catalog_cache_invalidation(self):
+        self.login_user()
+        self.assertIn(b'Film Test', self.app.get('/?q=test').data)
+
+        self.as_admin()
+        self.app.post('/admin/add_movie', data={'title': 'Laskar Pelangi', 'price': '35000', 'description': 'Sekolah di Belitung',
+                                                'showtime': '18:00', 'status': 'now', 'image': (io.BytesIO(b''), '')})
+        self.assertIn(b'Laskar Pelangi', self.app.get('/?q=belitung').data)
+        self.app.get('/admin/delete_movie/1')
+        self.assertNotIn(b'Film Test', self.app.get('/').data)
+
+    # tes agregat rating ikut berubah saat rating baru / diubah
+    def test_rating_stats_incremental(self):
+        self.login_user()
+        self.app.post('/rate_movie/1', data={'score': 5})
+        self.app.post('/rate_movie/1', data={'score': 3})
+        self.login_regular_user()
+        self.app.post('/rate_movie/1', data={'score': 4})
+
+        with app.app_context():
+            stats = db.session.get(RatingStats, 1)
+            self.assertEqual((stats.total, stats.count, stats.average), (7, 2, 3.5))
+            self.assertEqual((stats.hist_3, stats.hist_4, stats.hist_5), (1, 1, 0))
+            self.assertEqual(check_rating_stats(), [])
+
+        response = self.app.get('/movie/details/1')
+        self.assertIn(b'Berdasarkan 2 ulasan', response.data)
+
+    # tes integritas rating (unique user+film) dan pemeriksa konsistensi
+    def test_rating_unique_and_consistency_check(self):
+        with app.app_context():
+            db.session.add(Rating(user_id=1, movie_id=1, score=4))
+            db.session.commit()
+            db.session.add(Rating(user_id=1, movie_id=1, score=2))
+            with self.assertRaises(IntegrityError):
+                db.session.commit()
+            db.session.rollback()
+
+            # baris rating dimasukkan langsung tanpa lewat rate_movie -> agregat tertinggal
+            self.assertEqual(check_rating_stats(), [1])
+            self.assertEqual(check_rating_stats(fix=True), [1])
+            self.assertEqual(db.session.get(RatingStats, 1).hist_4, 1)
+            self.assertEqual(check_rating_stats(), [])
+
+    # tes reset + arsip: booking pindah tabel tapi riwayat dan laporan tetap lengkap
+    def test_reset_with_archive(self):
+        self.as_admin()
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'A2']})
+        response = self.app.get('/admin/reset_seats/1?archive=1', follow_redirects=True)
+        self.assertIn(b'2 kursi berhasil di-reset, 2 booking diarsipkan.', response.data)
+        with app.app_context():
+            self.assertEqual(Booking.query.count(), 0)
+            self.assertEqual(BookingArchive.query.filter_by(status='history').count(), 2)
+            self.assertEqual(archive_bookings(), 0)
+
+        self.assertIn(b'A2', self.app.get('/history').data)
+        today = datetime.now().strftime('%Y-%m-%d')
+        report = self.app.get(f'/admin/download_report?date={today}').data.decode('utf-8-sig')
+        self.assertEqual(report.count(';Film Test;A1, A2;100000;history'), 1)
+
+    # tes reset memindahkan rollup dengan jumlah statement tetap, berapa pun jumlah harinya
+    def test_reset_moves_rollups_set_based(self):
+        from datetime import date
+        with app.app_context():
+            for n in range(30):
+                day = date(2025, 1, 1) + timedelta(days=n)
+                db.session.add(DailySales(day=day, movie_id=1, status='booked', tickets=2, revenue=100000))
+                db.session.add(DailySales(day=day, movie_id=1, status='history', tickets=1, revenue=50000))
+            db.session.add(MovieSales(movie_id=1, status='booked', tickets=60, revenue=3000000))
+            db.session.add(MovieSales(movie_id=1, status='history', tickets=30, revenue=1500000))
+            db.session.commit()
+        self.as_admin()
+        with count_queries() as queries:
+            self.app.get('/admin/reset_seats/1')
+        self.assertLessEqual(queries.count, 12)
+        with app.app_context():
+            self.assertEqual(DailySales.query.filter_by(status='booked').count(), 0)
+            self.assertEqual({(r.tickets, r.revenue) for r in DailySales.query.filter_by(status='history')}, {(3, 150000)})
+            self.assertEqual(db.session.get(MovieSales, (1, 'history')).tickets, 90)
+            self.assertIsNone(db.session.get(MovieSales, (1, 'booked')))
+
+    # tes arsip dua kali: id booking yang dipakai ulang SQLite tidak bentrok di tabel arsip
+    def test_archive_twice(self):
+        self.as_admin()
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'A2']})
+        self.app.get('/admin/reset_seats/1?archive=1')
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'A2']})
+        response = self.app.get('/admin/reset_seats/1?archive=1', follow_redirects=True)
+        self.assertIn(b'2 kursi berhasil di-reset, 2 booking diarsipkan.', response.data)
+        with app.app_context():
+            rows = BookingArchive.query.order_by(BookingArchive.id).all()
+            self.assertEqual(len(rows), 4)
+            self.assertEqual(len({row.booking_id for row in rows}), 4)
+        self.assertEqual(self.app.get('/history').data.count(b'A1, A2'), 2)
+
+    # tes hapus film: semua tabel turunan ikut terhapus, poster dihapus di background
+    def test_delete_movie_cascade(self):
+        poster = os.path.join(app.config['UPLOAD_FOLDER'], 'test_hapus_poster.jpg')
+        open(poster, 'wb').close()
+        with app.app_context():
+            db.session.get(Movie, 1).image = 'test_hapus_poster.jpg'
+            db.session.commit()
+        self.as_admin()
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1']})
+        self.app.get('/admin/reset_seats/1?archive=1')
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1']})
+        response = self.app.get('/admin/delete_movie/1', follow_redirects=True)
+        self.assertIn(b'Film berhasil dihapus (2 booking, 0 rating).', response.data)
+        for _ in range(50):
+            if not os.path.exists(poster): break
+            time.sleep(0.02)
+        self.assertFalse(os.path.exists(poster))
+        with app.app_context():
+            for model in (Movie, Booking, BookingArchive, DailySales, MovieSales):
+                self.assertEqual(model.query.count(), 0)
+
+    # tes migrasi database lama: data ganda dibereskan sebelum unique index dibuat
+    def test_migrate_legacy_database(self):
+        with app.app_context():
+            self.assertEqual(migrate_database(), [1, 2, 3, 4, 5, 6, 7])
+            self.assertEqual(migrate_database(), [])
+
+            db.session.execute(db.text('DROP INDEX uq_booking_active_seat'))
+            db.session.execute(db.text('DROP INDEX uq_rating_user_movie'))
+            db.session.execute(db.text("INSERT INTO booking (user_id, movie_id, seat_number, booking_date, status) VALUES "
+                                       "(1, 1, 'A1', '2025-01-01 10:00:00', 'booked'), (2, 1, 'A1', '2025-01-01 10:05:00', 'booked')"))
+            db.session.execute(db.text('INSERT INTO rating (user_id, movie_id, score) VALUES (1, 1, 2), (1, 1, 5)'))
+            db.session.execute(db.delete(SchemaMigration))
+            db.session.commit()
+
+            self.assertEqual(migrate_database(), [1, 2, 3, 4, 5, 6, 7])
+            self.assertEqual([b.user_id for b in Booking.query.filter_by(status='booked')], [1])
+            self.assertEqual([r.score for r in Rating.query.all()], [5])
+            self.assertEqual(db.session.get(RatingStats, 1).hist_5, 1)
+            indexes = {i['name'] for i in db.inspect(db.engine).get_indexes('booking')}
+            self.assertTrue({'uq_booking_active_seat', 'ix_booking_movie_status', 'ix_booking_user_date'} <= indexes)
+
+    # tes pragma SQLite (WAL, busy_timeout) untuk database file
+    def test_sqlite_pragmas(self):
+        import tempfile
+        from sqlalchemy import create_engine
+        path = os.path.join(tempfile.mkdtemp(), 'pragma.db')
+        engine = create_engine('sqlite:///' + path)
+        with engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql('PRAGMA journal_mode').scalar(), 'wal')
+            self.assertEqual(conn.exec_driver_sql('PRAGMA busy_timeout').scalar(), app.config['SQLITE_BUSY_TIMEOUT_MS'])
+            self.assertEqual(conn.exec_driver_sql('PRAGMA synchronous').scalar(), 1) # NORMAL
+        engine.dispose()
+
+    # tes riwayat per order dengan cursor; booking lama dijadikan order oleh migrasi
+    # tes booking lama multi-kursi dengan waktu beda mikrodetik tetap jadi satu order
+    def test_backfill_orders_microsecond_skew(self):
+        t0 = datetime(2025, 1, 1, 10, 0, 0, 55419)
+        with app.app_context():
+            db.session.execute(db.insert(Booking), [
+                dict(user_id=1, movie_id=1, seat_number=seat, booking_date=t0 + timedelta(microseconds=us), status='history')
+                for seat, us in (('A1', 0), ('A2', 6), ('A3', 7))] + [
+                dict(user_id=1, movie_id=1, seat_number='B1', booking_date=t0 + timedelta(seconds=5), status='history')])
+            db.session.commit()
+            migrate_database()
+            orders = Order.query.order_by(Order.created_at).all()
+            self.assertEqual([(o.seat_count, o.total) for o in orders], [(3, 150000), (1, 50000)])
+            self.assertEqual(sorted(orders[0].seats.split(', ')), ['A1', 'A2', 'A3'])
+            self.assertEqual(orders[0].created_at, t0)
+            self.assertEqual(Booking.query.filter_by(order_id=orders[0].id).count(), 3)
+            self.assertEqual(Booking.query.filter(Booking.order_id.is_(None)).count(), 0)
+
+    def test_history_keyset_pages(self):
+        t0 = datetime(2025, 1, 1, 10, 0, 0)
+        with app.app_context():
+            rows = [dict(user_id=1, movie_id=1, seat_number=f'{row_label(i % 5)}{i // 5 + 1}', booking_date=t0 + timedelta(minutes=i // 3), status='history')
+                    for i in range(36)] # 12 transaksi x 3 kursi, tanpa order_id (data lama)
+            db.session.execute(db.insert(Booking), rows)
+            db.session.execute(db.insert(Booking), [dict(user_id=2, movie_id=1, seat_number='A1', booking_date=t0, status='history')])
+            db.session.commit()
+            migrate_database()
+            self.assertEqual(Order.query.count(), 13)
+            self.assertEqual(Booking.query.filter(Booking.order_id.is_(None)).count(), 0)
+            self.assertEqual(db.session.get(MovieSales, (1, 'history')).tickets, 37)
+
+            seen, cursor = [], None
+            while True:
+                orders, cursor = history_page(1, cursor, per_page=5)
+                seen += orders
+                if cursor is None: break
+            self.assertEqual(len(seen), 12)
+            newest = seen[0][0]
+            self.assertEqual((newest.created_at, newest.seat_count, newest.total), (t0 + timedelta(minutes=11), 3, 150000))
+            self.assertEqual(sorted(newest.seats.split(', ')), ['A8', 'D7', 'E7'])
+            self.assertEqual(seen[-1][0].created_at, t0)
+
+        self.login_user()
+        first = self.app.get('/history')
+        self.assertIn(f'#TX-{newest.id}'.encode(), first.data)
+        cursor = first.data.decode().split('data-cursor="')[1].split('"')[0]
+        page = self.app.get(f'/history/page?cursor={cursor}').json
+        self.assertEqual(page['next_cursor'], None)
+        self.assertEqual(len(page['orders']), 2)
+        self.assertEqual(sorted(page['orders'][-1]['seats']), ['A1', 'B1', 'C1'])
+        self.assertEqual(self.app.get('/history/page?cursor=rusak').status_code, 400)
+
+    # tes harga yang dibayar tetap walau harga film diubah
+    def test_order_keeps_paid_price(self):
+        self.login_user()
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'A2']})
+        with app.app_context():
+            order = Order.query.one()
+            self.assertEqual((order.seat_count, order.unit_price, order.total, order.seats), (2, 50000, 100000, 'A1, A2'))
+            self.assertEqual({b.order_id for b in Booking.query.all()}, {order.id})
+            db.session.get(Movie, 1).price = 75000
+            db.session.commit()
+            rebuild_sales_rollups()
+            self.assertEqual(db.session.get(MovieSales, (1, 'booked')).revenue, 100000)
+
+    # tes upload poster: nama hash isi file, varian WebP, header cache immutable
+    def test_poster_upload_pipeline(self):
+        import tempfile
+        import app as bioskop
+        if bioskop.Image is None: self.skipTest('Pillow belum terpasang')
+        folder, app.config['UPLOAD_FOLDER'] = app.config['UPLOAD_FOLDER'], tempfile.mkdtemp()
+        try:
+            def jpeg(color):
+                buf = io.BytesIO()
+                bioskop.Image.new('RGB', (1200, 1800), color).save(buf, 'JPEG')
+                buf.seek(0)
+                return buf
+
+            self.as_admin()
+            for color in ('red', 'blue'):
+                self.app.post('/admin/add_movie', data={'title': f'Film {color}', 'price': '40000', 'description': '-', 'showtime': '19:00',
+                                                        'status': 'now', 'image': (jpeg(color), 'poster.jpg')}, content_type='multipart/form-data')
+            with app.app_context():
+                names = [m.image for m in Movie.query.filter(Movie.image.is_not(None)).order_by(Movie.id)]
+            self.assertEqual(len(set(names)), 2)
+            self.assertTrue(all(bioskop.HASHED_NAME.match(n) for n in names))
+
+            made = make_poster_variants(names[0]) # sama dengan yang dikerjakan worker
+            self.assertEqual(made, [names[0].replace('.jpg', '_thumb.webp'), names[0].replace('.jpg', '_large.webp')])
+            with bioskop.Image.open(os.path.join(app.config['UPLOAD_FOLDER'], made[0])) as thumb:
+                self.assertEqual(thumb.size, (360, 540))
+            with app.test_request_context():
+                self.assertEqual(poster_url(names[0]), '/media/' + made[0])
+
+            response = self.app.get('/media/' + made[0])
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('immutable', response.headers['Cache-Control'])
+            self.assertIn('max-age=31536000', response.headers['Cache-Control'])
+            again = self.app.get('/media/' + made[0], headers={'If-None-Match': response.headers['ETag']})
+            self.assertEqual(again.status_code, 304)
+        finally:
+            app.config['UPLOAD_FOLDER'] = folder
+
+    # tes budget jumlah query per endpoint (tidak boleh tumbuh dengan jumlah film/booking)
+    def test_query_budgets(self):
+        self.as_admin()
+        with app.app_context():
+            db.session.add_all([Movie(title=f'Film {i}', price=40000, status='now') for i in range(20)])
+            db.session.commit()
+        self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['A1', 'A2']})
+        self.app.post('/book_ticket', json={'movie_id': 2, 'seats': ['A1']})
+        today = datetime.now().strftime('%Y-%m-%d')
+        budgets = [('get', '/', 1), ('get', '/movie/details/1', 3), ('get', '/movie/1/seats', 2), ('get', '/history', 1),
+                   ('get', '/history/page', 1), ('get', '/admin', 5), ('get', f'/admin/download_report?date={today}', 2)]
+        for method, url, budget in budgets:
+            with count_queries() as queries:
+                response = getattr(self.app, method)(url)
+                response.data # laporan di-stream
+            self.assertEqual(response.status_code, 200, url)
+            self.assertLessEqual(queries.count, budget, f'{url}: {queries.statements}')
+        with count_queries() as queries:
+            self.assertEqual(self.app.post('/book_ticket', json={'movie_id': 1, 'seats': ['B1', 'B2', 'B3']}).json['status'], 'success')
+        self.assertLessEqual(queries.count, 12)
+
+    # tes /metrics dan log query lambat (hanya aktif jika instrumentasi dinyalakan)
+    def test_metrics_endpoint(self):
+        self.assertEqual(self.app.get('/metrics').status_code, 404)
+        enable_instrumentation()
+        metrics.reset()
+        slow_ms, app.config['SLOW_QUERY_MS'] = app.config['SLOW_QUERY_MS'], 0
+        try:
+            self.login_user()
+            with self.assertLogs(app.logger, 'WARNING') as logs:
+                response = self.app.get('/movie/details/1')
+            self.assertIn('Query lambat', logs.output[0])
+            # parameter query (user_id, hash password di register) tidak ikut ke log
+            self.assertNotIn('(1,', ''.join(logs.output))
+            self.assertIn('queries"', response.headers['Server-Timing'])
+            self.app.get('/movie/details/1')
+            self.assertEqual(self.app.get('/metrics').status_code, 403) # tanpa token di luar debug
+            app.config['METRICS_TOKEN'] = 'rahasia'
+            self.assertEqual(self.app.get('/metrics').status_code, 403)
+            text = self.app.get('/metrics', headers={'Authorization': 'Bearer rahasia'}).data.decode()
+            self.assertIn(f'bioskop_worker_info{{pid="{os.getpid()}"}} 1', text) # angka per worker
+            self.assertIn('bioskop_requests_total{endpoint="movie_details_only",method="GET",status="200"} 2', text)
+            self.assertIn('bioskop_request_duration_seconds_count{endpoint="movie_details_only"} 2', text)
+            self.assertRegex(text, r'bioskop_sql_queries_total\{endpoint="movie_details_only"\} [1-9]')
+        finally:
+            app.config['SLOW_QUERY_MS'], app.config['METRICS_TOKEN'] = slow_ms, None
+            enable_instrumentation(False)
+        self.assertEqual(self.app.get('/metrics').status_code, 404)
+
+    # tes token bucket: burst habis -> tunggu, token terisi lagi sesuai rate
+    def test_token_bucket(self):
+        from app import TokenBucket
+        bucket = TokenBucket(burst=3, rate=0.5)
+        self.assertEqual([bucket.take('ip', now=100.0) for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.take('ip', now=100.0), 2.0)
+        self.assertEqual(bucket.take('lain', now=100.0), 0)
+        self.assertEqual(bucket.take('ip', now=102.0), 0)
+        self.assertGreater(bucket.take('ip', now=102.0), 0)
+
+        # take_all: satu bucket kosong -> tidak ada token yang diambil dari bucket lain
+        ip, user = TokenBucket(burst=2, rate=0.5), TokenBucket(burst=1, rate=0.1)
+        self.assertEqual(TokenBucket.take_all([(ip, 'x'), (user, 'u')], now=0.0), 0)
+        self.assertAlmostEqual(TokenBucket.take_all([(ip, 'x'), (user, 'u')], now=0.0), 10.0)
+        self.assertEqual(ip.take('x', now=0.0), 0)
+
+        # jumlah key dibatasi max_keys; yang dibuang key paling lama tidak dipakai
+        bucket = TokenBucket(burst=2, rate=0.1, max_keys=10)
+        for i in range(1000): bucket.take(f'ip{i}', now=float(i))
+        self.assertEqual(len(bucket.buckets), 10)
+        self.assertEqual(list(bucket.buckets)[0], 'ip990')
+        # percobaan yang ditolak tidak menyimpan key baru
+        ip, user = TokenBucket(burst=1, rate=0.1), TokenBucket(burst=5, rate=0.1)
+        self.assertEqual(TokenBucket.take_all([(ip, 'x'), (user, 'u0')], now=0.0), 0)
+        for i in range(1, 100): self.assertGreater(TokenBucket.take_all([(ip, 'x'), (user, f'u{i}')], now=0.0), 0)
+        self.assertEqual((len(ip.buckets), len(user.buckets)), (1, 1))
+
+    # tes limiter login per username ditolak sebelum hashing
+    def test_login_rate_limit(self):
+        for _ in range(app.config['LOGIN_USER_BURST']):
+            self.app.post('/login', data=dict(username='user_test', password='salah'))
+        response = self.app.post('/login', data=dict(username='user_test', password='123'))
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response.headers)
+        self.assertIn(b'Terlalu banyak percobaan', response.data)
+        # percobaan yang ditolak limiter username tidak menghabiskan token IP
+        for _ in range(app.config['LOGIN_IP_BURST']):
+            self.assertEqual(self.app.post('/login', data=dict(username='user_test', password='123')).status_code, 429)
+        # username lain dari IP yang sama masih boleh (batas IP lebih longgar)
+        self.assertEqual(self.app.post('/login', data=dict(username='admin_test', password='123')).status_code, 302)
+
+    # tes hash lama di-upgrade saat login (tidak pernah di-downgrade), dan pool hashing penuh -> 503
+    def test_password_rehash_and_busy_pool(self):
+        import app as bioskop
+        from werkzeug.security import generate_password_hash
+        def stored_hash():
+            with app.app_context():
+                return User.query.filter_by(username='user_test').one().password
+        def set_hash(method):
+            with app.app_context():
+                User.query.filter_by(username='user_test').one().password = generate_password_hash('123', method=method)
+                db.session.commit()
+        self.assertTrue(stored_hash().startswith('pbkdf2:sha256:1000000$'))
+        iterations, app.config['PASSWORD_HASH_ITERATIONS'] = app.config['PASSWORD_HASH_ITERATIONS'], 1000
+        try:
+            # iterasi tersimpan lebih tinggi dari konfigurasi: hash dibiarkan
+            self.assertEqual(self.login_regular_user().status_code, 200)
+            self.assertTrue(stored_hash().startswith('pbkdf2:sha256:1000000$'))
+            self.app.get('/logout')
+            # iterasi lebih rendah atau algoritma lain: di-upgrade
+            for method in ('pbkdf2:sha256:500', 'scrypt'):
+                set_hash(method)
+                self.assertEqual(self.login_regular_user().status_code, 200)
+                self.assertTrue(stored_hash().startswith('pbkdf2:sha256:1000$'))
+                self.app.get('/logout')
+            self.assertIn(b'/logout', self.login_regular_user().data)
+
+            taken = 0
+            while bioskop.hash_slots.acquire(blocking=False): taken += 1
+            try:
+                response = self.app.post('/login', data=dict(username='user_test', password='123'))
+            finally:
+                for _ in range(taken): bioskop.hash_slots.release()
+            self.assertEqual(response.status_code, 503)
+        finally:
+            app.config['PASSWORD_HASH_ITERATIONS'] = iterations
+
+    # tes state bersama lewat database: worker lain melihat invalidasi katalog dan event kursi
+    def test_shared_state_database(self):
+        import json
+        import app as bioskop
+        from app import CatalogCache, DatabaseState
+        other_worker = CatalogCache()
+        bioskop.shared_state, app.config['SHARED_STATE_CHECK_SECONDS'] = DatabaseState(), 0
+        try:
+            with app.app_context():
+                self.assertEqual([c.title for c in other_worker.get().now], ['Film Test'])
+            self.as_admin()
+            self.app.post('/admin/add_movie', data={'title': 'Laskar Pelangi', 'price': '35000', 'description': '',
+                                                    'showtime': '18:00', 'status': 'now', 'image': (io.BytesIO(b''), '')})
+            with app.app_context():
+                self.assertEqual([c.title for c in other_worker.get().now], ['Film Test', 'Laskar Pelangi'])
+
+                q = seat_broker.subscribe(1)
+                state = bioskop.shared_state
+                try:
+                    self.assertEqual(hold_seats(2, 1, ['A1', 'A2']), ([], unittest.mock.ANY)) # event ditulis di transaksi hold
+                    self.assertTrue(q.empty()) # baru sampai lewat poller, sama seperti worker lain
+                    self.assertEqual(state.poll(), 1)
+                    self.assertEqual(json.loads(q.get_nowait())['seats'], ['A1', 'A2'])
+                    self.assertEqual(state.poll(), 0)
+
+                    state.publish(1, 'held', ['B1'])
+                    db.session.rollback() # transaksi batal -> event ikut batal
+                    self.assertEqual(state.poll(), 0)
+
+                    # prune tidak pernah menghapus event terbaru, id baru tetap di atas posisi poller
+                    later = datetime.now() + timedelta(hours=1)
+                    self.assertEqual(state.prune(later), 0)
+                    for seat in ('C1', 'C2'):
+                        state.publish(1, 'held', [seat])
+                        db.session.commit()
+                    self.assertEqual(state.poll(), 2)
+                    self.assertEqual(state.prune(later), 2)
+                    state.publish(1, 'held', ['C3'])
+                    db.session.commit()
+                    self.assertEqual(state.poll(), 1)
+
+                    # commit tidak urut id (PostgreSQL): id lebih kecil yang muncul belakangan tetap terkirim sekali
+                    last = db.session.execute(db.select(db.func.max(bioskop.SeatEvent.id))).scalar()
+                    db.session.execute(db.insert(bioskop.SeatEvent).values(id=last + 5, movie_id=1, kind='held', seats='D2'))
+                    db.session.commit()
+                    self.assertEqual(state.poll(), 1)
+                    db.session.execute(db.insert(bioskop.SeatEvent).values(id=last + 2, movie_id=1, kind='held', seats='D1'))
+                    db.session.commit()
+                    self.assertEqual(state.poll(), 1)
+                    self.assertEqual(state.poll(), 0)
+                    self.assertEqual([json.loads(q.get_nowait())['seats'] for _ in range(q.qsize())][-2:], [['D2'], ['D1']])
+                finally:
+                    seat_broker.unsubscribe(1, q)
+        finally:
+            bioskop.shared_state, app.config['SHARED_STATE_CHECK_SECONDS'] = bioskop.LocalState(), 1
+
+    # tes limiter login lewat database: batasnya berlaku untuk semua worker bersama
+    def test_shared_rate_limit_database(self):
+        from app import DatabaseState, RateBucket, TokenBucket
+        ip, user = TokenBucket(burst=3, rate=0.5, name='ip'), TokenBucket(burst=1, rate=0.1, name='user')
+        workers = [DatabaseState(), DatabaseState()]
+        with app.app_context():
+            self.assertEqual([workers[i % 2].take_tokens([(ip, '1.2.3.4')], now=100.0) for i in range(3)], [0, 0, 0])
+            self.assertAlmostEqual(workers[1].take_tokens([(ip, '1.2.3.4')], now=100.0), 2.0)
+            self.assertEqual(workers[0].take_tokens([(ip, '1.2.3.4')], now=102.0), 0)
+            # satu bucket kosong -> token bucket lain tidak terpakai, key baru tidak tersimpan
+            self.assertEqual(workers[0].take_tokens([(ip, 'x'), (user, 'u')], now=0.0), 0)
+            self.assertAlmostEqual(workers[1].take_tokens([(ip, 'x'), (user, 'u')], now=0.0), 10.0)
+            self.assertAlmostEqual(workers[1].take_tokens([(ip, '1.2.3.4'), (user, 'baru')], now=102.0), 2.0)
+            self.assertEqual(db.session.execute(db.select(RateBucket.tokens).filter_by(scope='ip', key='x')).scalar(), 2)
+            self.assertIsNone(db.session.get(RateBucket, ('user', 'baru')))
+            # bucket yang sudah penuh lagi dibuang saat prune
+            workers[0].prune(datetime.fromtimestamp(1000.0))
+            self.assertEqual(db.session.execute(db.select(db.func.count()).select_from(RateBucket)).scalar(), 0)
+        # route login memakai shared_state aktif
+        import app as bioskop
+        bioskop.shared_state = workers[0]
+        try:
+            for _ in range(app.config['LOGIN_USER_BURST']):
+                self.app.post('/login', data=dict(username='user_test', password='salah'))
+            self.assertEqual(self.app.post('/login', data=dict(username='user_test', password='123')).status_code, 429)
+            self.assertEqual(ip_limiter.buckets, {}) # tidak ada state per proses
+        finally:
+            bioskop.shared_state = bioskop.LocalState()
+
+    # tes init-db: skema + admin dibuat lewat CLI, bukan saat worker start
+    def test_init_db_command_and_healthz(self):
+        result = app.test_cli_runner().invoke(args=['init-db', '--admin-password', 'rahasia'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('User admin dan data awal dibuat.', result.output)
+        with app.app_context():
+            self.assertEqual(Movie.query.count(), 1) # film contoh hanya untuk database kosong
+        self.assertEqual(self.app.post('/login', data=dict(username='admin', password='rahasia')).status_code, 302)
+        result = app.test_cli_runner().invoke(args=['init-db'])
+        self.assertNotIn('User admin', result.output)
+        self.assertEqual(self.app.get('/healthz').get_json(), {'status': 'ok'})
+
+    # tes secret key tanpa env: dibuat sekali lalu dipakai ulang semua proses
+    def test_secret_key_shared_file(self):
+        import tempfile
+        from unittest import mock
+        from app import load_secret_key
+        instance_path = app.instance_path
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(os.environ):
+            os.environ.pop('SECRET_KEY', None)
+            app.instance_path = tmp
+            try:
+                key = load_secret_key()
+                self.assertEqual(len(key), 64)
+                self.assertEqual(load_secret_key(), key)
+                self.assertEqual(os.listdir(tmp), ['secret_key'])
+                os.environ['SECRET_KEY'] = 'dari-env'
+                self.assertEqual(load_secret_key(), 'dari-env')
+            finally:
+                app.instance_path = instance_path
+
     # tes akses halaman (positif)
     def test_akses_home(self):
         self.login_user()
@@ -0,0 +1,8 @@
+"""Entry point WSGI produksi.
+
+    flask --app app init-db        # sekali, sebelum worker start
+    gunicorn -c gunicorn.conf.py wsgi:application
+"""
+from app import create_app
+
+application = create_app()